@@ -0,0 +1,80 @@
+import argparse
+import json
+import os
+import sys
+from typing import Iterator, List, Optional
+
+from .basic import Model, correct, correct_tiered
+from .cache import Cache, cached
+from .channel import ConfusionChannel
+from .engines import amend, create, load_table, names
+
+_folder = os.path.abspath(os.path.dirname(__file__))
+_words = r"[a-z]+(?:['-][a-z]+)*"
+
+
+def _lines(filenames: List[str], encoding: str) -> Iterator[str]:
+    if not filenames:
+        yield from sys.stdin
+        return
+
+    for filename in filenames:
+        if filename == '-':
+            yield from sys.stdin
+        else:
+            with open(filename, 'r', encoding=encoding, newline='') as file:
+                yield from file
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='corrector', description='Correct the spelling of files or stdin.')
+    parser.add_argument('files', nargs='*', help='files to correct (default: stdin)')
+    parser.add_argument('--dictionary', default=os.path.join(_folder, 'words.json'), help='dictionary model')
+    parser.add_argument('--errors', default=os.path.join(_folder, 'errors.json'), help='error model')
+    parser.add_argument('--channel', help='confusion channel built by convertor (replaces --errors)')
+    parser.add_argument('-d', '--distance', type=int, default=2, help='maximum edit distance')
+    parser.add_argument('--engine', choices=names, default='edits',
+                        help='candidate search')
+    parser.add_argument('--hot', type=int, help='search the N most frequent words first, the full dictionary after')
+    parser.add_argument('--cache', type=int, default=65536, help='size of the correction cache')
+    parser.add_argument('--encoding', default='utf-8', help='encoding of the input files')
+    parser.add_argument('--table', help='precomputed correction table built by corrector.table')
+    parser.add_argument('--stats', action='store_true', help='print profiling statistics to stderr')
+    args = parser.parse_args(argv)
+
+    if args.dictionary.endswith('.json'):
+        dictionary = Model.load(args.dictionary)
+    else:
+        dictionary = Model.load_compact(args.dictionary)
+    if args.channel:
+        errors = ConfusionChannel.load(args.channel)
+    else:
+        errors = Model.load(args.errors)
+    engine = create(args.engine, dictionary, args.distance)
+    table = load_table(args.table, dictionary, errors, args.distance) if args.table else None
+
+    cache = Cache(args.cache)
+    if args.hot:
+        hot = dictionary.prune(top=args.hot, pattern=_words)
+        fix = cached(correct_tiered, cache)
+        tiers, engines = (hot, dictionary), (create(args.engine, hot, args.distance), engine)
+    else:
+        fix = cached(correct, cache)
+        tiers, engines = dictionary, engine
+    stats = None
+    if args.stats:
+        from .instrument import enable
+        stats = enable()
+        stats.watch('corrections', cache)
+    for line in amend(_lines(args.files, args.encoding), dictionary,
+                      lambda word: fix(word, tiers, errors, args.distance, engines, table)):
+        sys.stdout.write(line)
+    if stats is not None:
+        json.dump(stats.snapshot(), sys.stderr, indent=2)
+        sys.stderr.write('\n')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,17 @@
+import hashlib
+import heapq
 import json
 import logging
-import os
+import math
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Counter, Hashable, Iterable, List, Mapping, Optional, Set, Union
+from abc import ABC, abstractmethod
+from array import array
+from operator import itemgetter
+from time import perf_counter
+from typing import Counter, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
 
 _logger = logging.getLogger(__name__)
+_stats = None
 
 
 def load(filename: str) -> Optional[str]:
@@ -32,17 +38,145 @@ def parse(content: str) -> List[str]:
 characters = "abcdefghijklmnopqrstuvwxyz'-"
 
 
+def edits(word: str, alphabet: str = characters) -> Iterator[str]:
+    for i in range(len(word) + 1):
+        head, tail = word[:i], word[i:]
+        if tail:
+            yield head + tail[1:]
+            if len(tail) > 1:
+                yield head + tail[1] + tail[0] + tail[2:]
+            rest = tail[1:]
+            for ch in alphabet:
+                yield head + ch + rest
+        for ch in alphabet:
+            yield head + ch + tail
+
+
+def viable_edits(word: str, prefixes: Mapping[str, str], alphabet: str = characters) -> Iterator[str]:
+    for i in range(len(word) + 1):
+        head, tail = word[:i], word[i:]
+        following = prefixes.get(head)
+        if following is None:
+            return
+        if tail:
+            if len(tail) == 1 or tail[1] in following:
+                yield head + tail[1:]
+            if len(tail) > 1 and tail[1] in following:
+                yield head + tail[1] + tail[0] + tail[2:]
+            rest = tail[1:]
+            for ch in following:
+                if ch in alphabet:
+                    yield head + ch + rest
+        for ch in following:
+            if ch in alphabet:
+                yield head + ch + tail
+
+
+def hopeless(word: str, bigrams: Set[str]) -> bool:
+    bad = [i for i in range(len(word) - 1) if word[i:i + 2] not in bigrams]
+    return bool(bad) and bad[-1] - bad[0] > 2
+
+
+def signature(word: str) -> int:
+    result = 0
+    for ch in set(word):
+        result |= 1 << (ord(ch) & 63)
+
+    return result
+
+
 def edit(word: str) -> Set[str]:
-    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
-    result = {lx + rx[1:] for lx, rx in splits if rx}
-    result |= {lx + rx[1] + rx[0] + rx[2:] for lx, rx in splits if len(rx) > 1}
-    result |= {lx + ch + rx[1:] for lx, rx in splits if rx for ch in characters}
-    result |= {lx + ch + rx for lx, rx in splits for ch in characters}
+    result = set(edits(word))
+    if _stats is not None:
+        _stats.count('edit.calls')
+        _stats.count('edit.generated', len(result))
 
     return result
 
 
+def distance(source: str, target: str, limit: Optional[int] = None, alphabet: Optional[str] = None) -> int:
+    if limit is not None and abs(len(source) - len(target)) > limit:
+        return limit + 1
+
+    result = _distance(source, target, limit)
+    if alphabet is None or (limit is not None and result > limit) or all(ch in alphabet for ch in target):
+        return result
+    if Counter(ch for ch in target if ch not in alphabet) - Counter(source):
+        return limit + 1 if limit is not None else len(source) ** 2 + len(target) + 1
+
+    bound = _distance(source, target, limit, alphabet)
+    unbounded = limit is None and bound > len(source) + len(target)
+    while (unbounded or result < bound) and not _reaches(source, target, result, alphabet):
+        result += 1
+
+    return result
+
+
+def _distance(source: str, target: str, limit: Optional[int] = None, alphabet: Optional[str] = None) -> int:
+    outside = [0] * (len(target) + 1)
+    for j, ch in enumerate(target):
+        outside[j + 1] = outside[j] + (alphabet is not None and ch not in alphabet)
+    infinity = len(source) + len(target) + (limit or 0) + 1
+    rows = [[j if not outside[j] else infinity for j in range(len(target) + 1)]]
+    last: Dict[str, int] = {}
+    for i in range(1, len(source) + 1):
+        previous, current, matched = rows[-1], [i] + [0] * len(target), 0
+        for j in range(1, len(target) + 1):
+            k, m = last.get(target[j - 1], 0), matched
+            fresh = infinity if outside[j] > outside[j - 1] else 1
+            if source[i - 1] == target[j - 1]:
+                cost, matched = 0, j
+            else:
+                cost = fresh
+            current[j] = min(previous[j] + 1, current[j - 1] + fresh, previous[j - 1] + cost)
+            if k and m and outside[j - 1] == outside[m]:
+                current[j] = min(current[j], rows[k - 1][m - 1] + (i - k - 1) + 1 + (j - m - 1))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        last[source[i - 1]] = i
+        rows.append(current)
+
+    return rows[-1][-1] if limit is None else min(rows[-1][-1], limit + 1)
+
+
+def _reaches(source: str, target: str, n: int, alphabet: str) -> bool:
+    chars = ''.join(set(source) | set(alphabet))
+    forward, backward = {source}, {target}
+    for step in range(n):
+        if step % 2:
+            backward |= {item for e in backward for item in _origins(e, alphabet, chars)}
+        else:
+            forward |= {item for e in forward for item in edits(e, alphabet)}
+
+    return not forward.isdisjoint(backward)
+
+
+def _origins(word: str, alphabet: str, chars: str) -> Iterator[str]:
+    for i in range(len(word) + 1):
+        head, tail = word[:i], word[i:]
+        for ch in chars:
+            yield head + ch + tail
+        if tail:
+            if len(tail) > 1:
+                yield head + tail[1] + tail[0] + tail[2:]
+            if tail[0] in alphabet:
+                yield head + tail[1:]
+                for ch in chars:
+                    yield head + ch + tail[1:]
+
+
 def get_candidates(word: str, d: int = 2):
+    if _stats is not None:
+        started = perf_counter()
+        result = _get_candidates(word, d)
+        _stats.count('candidates.%d' % d, len(result))
+        _stats.time('generate', perf_counter() - started)
+        return result
+
+    return _get_candidates(word, d)
+
+
+def _get_candidates(word: str, d: int):
     if d <= 0:
         return {word}
     elif d == 1:
@@ -52,31 +186,207 @@ def get_candidates(word: str, d: int = 2):
     else:
         result = {word}
         for _ in range(d):
-            with ThreadPoolExecutor(8) as pool:
-                futures = {pool.submit(edit, candidate) for candidate in result}
-                result = set()
-                for candidate in as_completed(futures):
-                    result |= candidate.result()
+            result = {item for e in result for item in edit(e)}
+
+    return result
+
+
+def candidates(word: str, dictionary: 'Model', d: int = 2,
+               engine: Optional['Engine'] = None) -> Iterator[Tuple[int, Set[str]]]:
+    stats = _stats
+    if stats is not None:
+        stats.length(len(word))
+
+    if engine is not None:
+        started = perf_counter() if stats is not None else 0.0
+        found = engine.search(word, d)
+        if stats is not None:
+            stats.time('search', perf_counter() - started)
+            for _, dist in found:
+                stats.count('hits.%d' % dist)
+        yield from _tiers(found, d)
+        return
+
+    seen, level = {word}, {word}
+    for i in range(d + 1):
+        if i > 0:
+            started = perf_counter() if stats is not None else 0.0
+            level = _expand(level, dictionary, i == d) - seen
+            seen |= level
+            if stats is not None:
+                stats.time('generate', perf_counter() - started)
+        found = dictionary.filter(level)
+        if stats is not None:
+            stats.count('candidates.%d' % i, len(level))
+            stats.count('hits.%d' % i, len(found))
+        yield i, found
+
+
+def _tiers(found: Iterable[Tuple[str, int]], d: int) -> Iterator[Tuple[int, Set[str]]]:
+    tiers: List[Set[str]] = [set() for _ in range(d + 1)]
+    for candidate, dist in found:
+        tiers[dist].add(candidate)
+
+    return enumerate(tiers)
+
+
+def _expand(level: Iterable[str], dictionary: 'Model', last: bool) -> Set[str]:
+    if not last:
+        return {item for e in level for item in edit(e)}
+
+    prefixes, bigrams = dictionary.prefixes(), dictionary.bigrams()
+    return {item for e in level if not hopeless(e, bigrams) for item in viable_edits(e, prefixes)}
+
+
+def correct(word: str, dictionary: 'Model', errors: Union['Model', 'Channel'], d: int = 2,
+            engine: Optional['Engine'] = None, table: Optional[Mapping[str, str]] = None) -> str:
+    if table is not None:
+        known = table.get(word)
+        if known is not None:
+            return known
+
+    found = suggest(word, dictionary, errors, 1, d, engine)
+    return found[0][0] if found else word
+
+
+def correct_tiered(word: str, tiers: Sequence['Model'], errors: Union['Model', 'Channel'], d: int = 2,
+                   engines: Sequence[Optional['Engine']] = (), table: Optional[Mapping[str, str]] = None) -> str:
+    if word in tiers[-1]:
+        return word
+    if table is not None:
+        known = table.get(word)
+        if known is not None:
+            return known
+
+    for i, tier in enumerate(tiers):
+        found = suggest(word, tier, errors, 1, d, engines[i] if i < len(engines) else None)
+        if found:
+            candidate, _, dist = found[0]
+            if dist > 1 and i + 1 < len(tiers):
+                closer = correct_tiered(word, tiers[i + 1:], errors, dist - 1, engines[i + 1:])
+                if closer != word:
+                    return closer
+            return candidate
+
+    return word
+
+
+def suggest(word: str, dictionary: 'Model', errors: Union['Model', 'Channel'], k: int = 5, d: int = 2,
+            engine: Optional['Engine'] = None) -> List[Tuple[str, float, int]]:
+    return _rank(word, candidates(word, dictionary, d, engine), dictionary, errors, k, d)
+
+
+def _rank(word: str, found: Iterable[Tuple[int, Iterable[str]]], dictionary: 'Model', errors: Union['Model', 'Channel'],
+          k: int, d: int) -> List[Tuple[str, float, int]]:
+    if k <= 0:
+        return []
 
+    channel = errors if isinstance(errors, Channel) else DistanceChannel(errors)
+    priors = channel.priors(word, d)
+    bounds = [max(priors[i:]) + dictionary.logmax() for i in range(d + 1)] + [-math.inf]
+
+    stats = _stats
+    heap: List[Tuple[float, str, int]] = []
+    for dist, hits in found:
+        for candidate in hits:
+            started = perf_counter() if stats is not None else 0.0
+            prior = priors[dist] if channel.exact else channel.logprob(word, candidate, dist)
+            score = prior + dictionary.logprob(candidate)
+            if len(heap) < k:
+                heapq.heappush(heap, (score, candidate, dist))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, candidate, dist))
+            if stats is not None:
+                stats.count('scored')
+                stats.time('score', perf_counter() - started)
+        if len(heap) == k and heap[0][0] >= bounds[dist + 1]:
+            break
+
+    return [(candidate, score, dist) for score, candidate, dist in sorted(heap, key=itemgetter(0), reverse=True)]
+
+
+def review(text: str, dictionary: 'Model', errors: 'Model', d: int = 2, engine: Optional['Engine'] = None) -> str:
+    if _stats is None:
+        return ' '.join([correct(word, dictionary, errors, d, engine) for word in text.split()])
+
+    started = perf_counter()
+    words = text.split()
+    result = ' '.join([correct(word, dictionary, errors, d, engine) for word in words])
+    _stats.count('review.calls')
+    _stats.count('review.words', len(words))
+    _stats.time('review', perf_counter() - started)
     return result
 
 
-def correct(word: str, dictionary: 'Model', errors: 'Model', d: int = 2) -> str:
-    best, result = None, None
-    for i in range(d):
-        candidates = get_candidates(word, d)
-        candidates = dictionary.filter(candidates)
-        for candidate in candidates:
-            # prob = errors.prob(i) * dictionary.prob(candidate)
-            prob = dictionary.prob(candidate)
-            if best is None or prob > best:
-                best, result = prob, candidate
+def correct_batch(tokens: Iterable[str], dictionary: 'Model', errors: 'Model', d: int = 2,
+                  engine: Optional['Engine'] = None, table: Optional[Mapping[str, str]] = None) -> List[str]:
+    tokens = list(tokens)
+    unknown = list({token for token in tokens if token not in dictionary})
+    if table is not None:
+        known = {token: table.get(token) for token in unknown}
+        unknown = [token for token in unknown if known[token] is None]
+    if engine is None:
+        corrections = {token: correct(token, dictionary, errors, d) for token in unknown}
+    else:
+        corrections = {}
+        for token, found in zip(unknown, engine.search_many(unknown, d)):
+            best = _rank(token, _tiers(found, d), dictionary, errors, 1, d)
+            corrections[token] = best[0][0] if best else token
+    if table is not None:
+        corrections.update((token, value) for token, value in known.items() if value is not None)
+
+    return [corrections.get(token, token) for token in tokens]
+
+
+def review_many(texts: Iterable[str], dictionary: 'Model', errors: 'Model', d: int = 2,
+                engine: Optional['Engine'] = None) -> List[str]:
+    texts = [text.split() for text in texts]
+    unique = list({token for tokens in texts for token in tokens})
+    corrections = dict(zip(unique, correct_batch(unique, dictionary, errors, d, engine)))
+
+    return [' '.join(corrections[token] for token in tokens) for tokens in texts]
 
-    return result or word
 
+class Engine(ABC):
+    @abstractmethod
+    def search(self, word: str, d: int = 2) -> List[Tuple[str, int]]:
+        pass
 
-def review(text: str, dictionary: 'Model', errors: 'Model', d: int = 2) -> str:
-    return ' '.join([correct(word, dictionary, errors) for word in text.split()])
+    def search_many(self, words: Iterable[str], d: int = 2) -> Iterator[List[Tuple[str, int]]]:
+        return (self.search(word, d) for word in words)
+
+
+class Channel(ABC):
+    exact = False
+
+    @abstractmethod
+    def fingerprint(self) -> int:
+        pass
+
+    @abstractmethod
+    def logprob(self, word: str, candidate: str, dist: int) -> float:
+        pass
+
+    @abstractmethod
+    def priors(self, word: str, d: int = 2) -> List[float]:
+        pass
+
+
+class DistanceChannel(Channel):
+    exact = True
+
+    def __init__(self, errors: 'Model'):
+        self._errors = errors
+
+    def fingerprint(self) -> int:
+        return self._errors.fingerprint()
+
+    def logprob(self, word: str, candidate: str, dist: int) -> float:
+        return self._errors.logprob(dist) - dist * math.log(len(characters) * (2 * len(word) + 1))
+
+    def priors(self, word: str, d: int = 2) -> List[float]:
+        spread = math.log(len(characters) * (2 * len(word) + 1))
+        return [self._errors.logprob(i) - i * spread for i in range(d + 1)]
 
 
 class Model:
@@ -85,14 +395,56 @@ class Model:
         with open(filename, 'r') as file:
             return Model({int(k) if k.isdigit() else k: v for k, v in json.load(file).items()})
 
+    @staticmethod
+    def load_compact(filename: str) -> 'Model':
+        from .compact import Counts
+
+        model = Model(())
+        model._data = Counts(filename)
+        model._total = sum(model._data.values())
+        return model
+
     def __init__(self, data: Union[Iterable, Mapping]):
         self._data = Counter(data)
+        self._total = sum(self._data.values())
+        self._logprobs: Optional[Union[Dict[Hashable, float], array]] = None
+        self._logmax = -math.inf
+        self._version = 0
+        self._prefixes: Optional[Mapping[str, str]] = None
+        self._bigrams: Optional[Set[str]] = None
+        self._partitions: Optional[Dict[int, Dict[int, Set[str]]]] = None
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __getitem__(self, key: Hashable) -> int:
+        return self._data[key]
 
     def best(self, n: int = 1) -> List[Hashable]:
         return [x[0] for x in self._data.most_common(n)]
 
+    def bigrams(self) -> Set[str]:
+        if self._bigrams is None:
+            self._index()
+        return self._bigrams
+
     def filter(self, keys: Iterable[Hashable]) -> Set[Hashable]:
-        return set(keys).intersection(self._data)
+        if _stats is None:
+            return {key for key in keys if key in self._data}
+
+        started = perf_counter()
+        keys = list(keys)
+        found = {key for key in keys if key in self._data}
+        _stats.count('filter.lookups', len(keys))
+        _stats.count('filter.hits', len(found))
+        _stats.time('filter', perf_counter() - started)
+        return found
+
+    def fingerprint(self) -> int:
+        digest = hashlib.blake2b(digest_size=8)
+        for key, value in sorted((str(k), v) for k, v in self._data.items()):
+            digest.update(('%s\t%d\n' % (key, value)).encode('utf-8'))
+        return int.from_bytes(digest.digest(), 'little')
 
     def freq(self, key: Hashable) -> int:
         return self._data[key]
@@ -100,35 +452,155 @@ class Model:
     def keys(self) -> Iterable[Hashable]:
         return self._data.keys()
 
+    def logmax(self) -> float:
+        if self._logprobs is None:
+            self._tabulate()
+        return self._logmax
+
+    def logprob(self, key: Hashable) -> float:
+        if self._logprobs is None:
+            self._tabulate()
+        if isinstance(self._logprobs, array):
+            i = self._data.index(key)
+            return self._logprobs[i] if i >= 0 else -math.inf
+        return self._logprobs.get(key, -math.inf)
+
+    def near(self, word: str, d: int = 2) -> Iterator[str]:
+        if self._partitions is None:
+            self._partition(self._data)
+        mask = signature(word)
+        for length in range(max(0, len(word) - d), len(word) + d + 1):
+            for other, keys in self._partitions.get(length, {}).items():
+                if bin(mask ^ other).count('1') <= 2 * d:
+                    yield from keys
+
+    def prefixes(self) -> Mapping[str, str]:
+        if self._prefixes is None:
+            self._index()
+        return self._prefixes
+
     def prob(self, key: Hashable) -> float:
-        return self._data[key] / self.total()
+        return self._data[key] / self._total
+
+    def probs(self, keys: Iterable[Hashable]) -> Dict[Hashable, float]:
+        total = self._total
+        return {key: self._data[key] / total for key in keys}
+
+    def prune(self, min_count: int = 1, top: Optional[int] = None, pattern: Optional[str] = None) -> 'Model':
+        regex = re.compile(pattern) if pattern else None
+        items = [(k, v) for k, v in self._data.items() if v >= min_count and (regex is None or regex.fullmatch(str(k)))]
+        if top is not None:
+            items = heapq.nlargest(top, items, key=itemgetter(1))
+
+        return Model(dict(items))
 
     def save(self, filename: str):
         with open(filename, 'w') as file:
             json.dump({k: v for k, v in self._data.items()}, file, indent=4, sort_keys=True)
 
+    def save_compact(self, filename: str):
+        from .compact import write
+
+        write(filename, self._data.items())
+
     def size(self):
         return len(self._data)
 
     def subtract(self, data: Union[Iterable, Mapping]):
-        self._data.subtract(data)
-        self._data = self._data._keep_positive()
+        if not isinstance(data, Mapping):
+            data = Counter(data)
+        self._writable()
+        self._logprobs = None
+        self._prefixes = self._bigrams = None
+        self._version += 1
+        for key, value in data.items():
+            before = self._data.get(key, 0)
+            after = before - value
+            if after > 0:
+                if key not in self._data and self._partitions is not None:
+                    self._partition((key,))
+                self._data[key] = after
+                self._total += after - before
+            elif key in self._data:
+                del self._data[key]
+                self._total -= before
+                if self._partitions is not None and isinstance(key, str):
+                    self._unpartition(key)
+
+    def _index(self):
+        if not isinstance(self._data, Counter):
+            from .compact import Prefixes
+
+            self._prefixes = Prefixes(self._data)
+            self._bigrams = {word[i - 1:i + 1] for word in self._data for i in range(1, len(word))}
+            return
+
+        following: Dict[str, Set[str]] = {}
+        bigrams = set()
+        for word in self._data:
+            if not isinstance(word, str):
+                continue
+            for i, ch in enumerate(word):
+                following.setdefault(word[:i], set()).add(ch)
+                if i:
+                    bigrams.add(word[i - 1:i + 1])
+            following.setdefault(word, set())
+        self._prefixes = {key: ''.join(sorted(value)) for key, value in following.items()}
+        self._bigrams = bigrams
+
+    def _partition(self, keys: Iterable[Hashable]):
+        if self._partitions is None:
+            self._partitions = {}
+        for key in keys:
+            if isinstance(key, str):
+                self._partitions.setdefault(len(key), {}).setdefault(signature(key), set()).add(key)
+
+    def _tabulate(self):
+        total = math.log(self._total) if self._total > 0 else 0.0
+        if isinstance(self._data, Counter):
+            self._logprobs = {k: math.log(v) - total for k, v in self._data.items() if v > 0}
+            self._logmax = max(self._logprobs.values(), default=-math.inf)
+        else:
+            self._logprobs = array('d', (math.log(v) - total if v > 0 else -math.inf for v in self._data.values()))
+            self._logmax = max(self._logprobs, default=-math.inf)
 
     def total(self) -> int:
-        return sum(self._data.values())
+        return self._total
 
     def update(self, data: Union[Iterable, Mapping]):
+        if not isinstance(data, Mapping):
+            data = Counter(data)
+        self._writable()
         self._data.update(data)
+        self._total += sum(data.values())
+        self._logprobs = None
+        self._prefixes = self._bigrams = None
+        self._version += 1
+        if self._partitions is not None:
+            self._partition(data.keys())
+
+    def version(self) -> int:
+        return self._version
+
+    def _unpartition(self, key: str):
+        partition = self._partitions.get(len(key), {})
+        mask = signature(key)
+        keys = partition.get(mask, set())
+        keys.discard(key)
+        if not keys:
+            partition.pop(mask, None)
+
+    def _writable(self):
+        if not isinstance(self._data, Counter):
+            self._data = Counter(dict(self._data.items()))
 
 
 if __name__ == '__main__':
-    filename = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'content.txt')
-    content = load(filename)
-    words = parse(content)
+    from . import models
 
-    errors = Model.load('errors.json')
+    errors = models.get('errors')
 
-    dictionary = Model(words)
+    dictionary = models.get('content')
     dictionary.save('words.json')
 
     print('Size:', dictionary.size())
@@ -0,0 +1,229 @@
+import argparse
+import json
+import logging
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from jellyfish import damerau_levenshtein_distance
+
+from . import convertor, models
+from .basic import correct, parse, suggest
+from .channel import ConfusionChannel
+from .decoder import decode
+from .engines import create, names
+from .ngrams import NGrams
+
+_logger = logging.getLogger(__name__)
+
+Sample = Tuple[str, str, str, int]
+
+
+def samples(sources: Optional[Sequence[str]] = None) -> List[Sample]:
+    result, seen = [], set()
+    for row in convertor.rows(sources):
+        error, right, source = str(row['error']).lower(), str(row['correct']).lower(), row['source']
+        if ' ' in error or ' ' in right:
+            continue
+        if (error, right, source) not in seen:
+            seen.add((error, right, source))
+            result.append((error, right, source, damerau_levenshtein_distance(error, right)))
+
+    return result
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def _summary(hits: List[bool], ranks: List[bool], latencies: List[float]) -> Dict[str, Any]:
+    total = sum(latencies)
+    return {
+        'words': len(hits),
+        'top1': sum(hits) / len(hits) if hits else 0.0,
+        'topk': sum(ranks) / len(ranks) if ranks else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'words_per_second': len(latencies) / total if total else 0.0,
+    }
+
+
+def measure(name: str, fix: Callable[[str], str], rank: Callable[[str, int], List[str]], data: Sequence[Sample],
+            k: int = 5, memory: int = 200) -> Dict[str, Any]:
+    groups: Dict[Tuple[str, Any], Tuple[List, List, List]] = defaultdict(lambda: ([], [], []))
+    for error, right, source, dist in data:
+        start = time.perf_counter()
+        result = fix(error)
+        elapsed = time.perf_counter() - start
+        ranked = right in rank(error, k)
+        for key in (('all', 'all'), ('source', source), ('distance', dist)):
+            hits, ranks, latencies = groups[key]
+            hits.append(result == right)
+            ranks.append(ranked)
+            latencies.append(elapsed)
+
+    tracemalloc.start()
+    for error, _, _, _ in data[:memory]:
+        fix(error)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    report = {'corrector': name, 'k': k, 'peak_memory_bytes': peak, 'by_source': {}, 'by_distance': {}}
+    for (kind, key), values in sorted(groups.items(), key=lambda x: (x[0][0], str(x[0][1]))):
+        if kind == 'all':
+            report.update(_summary(*values))
+        else:
+            report['by_' + kind][str(key)] = _summary(*values)
+
+    return report
+
+
+def corrupt(lines: Iterable[str], data: Sequence[Sample], rate: float = 0.2,
+            seed: int = 0) -> List[Tuple[List[str], List[str]]]:
+    rng, misspellings = random.Random(seed), defaultdict(list)
+    for error, right, _, _ in data:
+        misspellings[right].append(error)
+
+    result = []
+    for line in lines:
+        clean = parse(line)
+        if clean:
+            noisy = [rng.choice(misspellings[w]) if w in misspellings and rng.random() < rate else w for w in clean]
+            result.append((noisy, clean))
+
+    return result
+
+
+def decoding(sentences: Sequence[Tuple[List[str], List[str]]], lm: NGrams, beams: Iterable[int], d: int = 2,
+             engine: str = 'edits', channel: Optional[str] = None, width: int = 16) -> List[Dict[str, Any]]:
+    dictionary = models.get('words')
+    errors = ConfusionChannel.load(channel) if channel else models.get('errors')
+    search = create(engine, dictionary, d)
+
+    results = []
+    for beam in beams:
+        hits, latencies, words = 0, [], 0
+        for noisy, clean in sentences:
+            start = time.perf_counter()
+            fixed = decode(noisy, lm, dictionary, errors, d, search, beam, width)
+            latencies.append(time.perf_counter() - start)
+            hits += sum(a == b for a, b in zip(fixed, clean))
+            words += len(clean)
+        total = sum(latencies)
+        results.append({
+            'beam': beam,
+            'width': width,
+            'sentences': len(sentences),
+            'words': words,
+            'accuracy': hits / words if words else 0.0,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'words_per_second': words / total if total else 0.0,
+        })
+
+    return results
+
+
+def _basic(d: int, engine: str,
+           channel: Optional[str] = None) -> Tuple[Callable[[str], str], Callable[[str, int], List[str]]]:
+    dictionary = models.get('words')
+    errors = ConfusionChannel.load(channel) if channel else models.get('errors')
+    search = create(engine, dictionary, d)
+
+    def rank(word: str, k: int) -> List[str]:
+        return [candidate for candidate, _, _ in suggest(word, dictionary, errors, k, d, search)]
+
+    return (lambda word: correct(word, dictionary, errors, d, search)), rank
+
+
+def _norvig() -> Tuple[Callable[[str], str], Callable[[str, int], List[str]]]:
+    from . import norvig
+    models.get('norvig')
+
+    def rank(word: str, k: int) -> List[str]:
+        return [candidate for candidate, _ in norvig.suggestions(word, k)]
+
+    return norvig.correction, rank
+
+
+def run(correctors: Iterable[str], data: Sequence[Sample], d: int = 2, engine: str = 'edits', k: int = 5,
+        memory: int = 200, channel: Optional[str] = None) -> Dict[str, Any]:
+    results = []
+    for name in correctors:
+        try:
+            fix, rank = _basic(d, engine, channel) if name == 'basic' else _norvig()
+        except Exception as e:
+            _logger.warning('Skipping %s: %s', name, e)
+            continue
+        results.append(measure(name, fix, rank, data, k, memory))
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'distance': d,
+        'engine': engine,
+        'channel': channel or 'distance',
+        'samples': len(data),
+        'results': results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='corrector.benchmark', description='Benchmark the correctors on 0643.')
+    parser.add_argument('--correctors', default='basic,norvig', help='comma-separated correctors to run')
+    parser.add_argument('--sources', default='', help='comma-separated sources, e.g. abo.dat (default: all)')
+    parser.add_argument('--engine', choices=names, default='edits',
+                        help='candidate search')
+    parser.add_argument('--channel', help='confusion channel built by convertor (default: errors.json)')
+    parser.add_argument('-d', '--distance', type=int, default=2, help='maximum edit distance')
+    parser.add_argument('-k', type=int, default=5, help='size of the top-k list')
+    parser.add_argument('--limit', type=int, default=0, help='random sample of the pairs (default: all)')
+    parser.add_argument('--memory', type=int, default=200, help='words traced for peak memory')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random sample')
+    parser.add_argument('--lm', help='n-gram language model for the context decoder')
+    parser.add_argument('--text', help='clean sentences to corrupt and decode with --lm')
+    parser.add_argument('--beams', default='1,2,4,8', help='comma-separated beam widths to decode with')
+    parser.add_argument('--rate', type=float, default=0.2, help='share of words misspelled in --text')
+    parser.add_argument('--output', default='benchmark.json', help='machine-readable results')
+    args = parser.parse_args(argv)
+
+    data = samples([s for s in args.sources.split(',') if s])
+    if args.limit:
+        data = random.Random(args.seed).sample(data, min(args.limit, len(data)))
+
+    report = run([c for c in args.correctors.split(',') if c], data, args.distance, args.engine, args.k,
+                 args.memory, args.channel)
+    if args.lm and args.text:
+        with open(args.text, 'r') as file:
+            sentences = corrupt(file, data, args.rate, args.seed)
+        report['decoding'] = decoding(sentences, NGrams(args.lm), [int(b) for b in args.beams.split(',')],
+                                      args.distance, args.engine, args.channel)
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=4, sort_keys=True)
+
+    for result in report['results']:
+        print('%-8s top1 %.3f  top%d %.3f  p50 %.2fms  p95 %.2fms  p99 %.2fms  %.1f words/s  peak %.2fMB' % (
+            result['corrector'], result['top1'], args.k, result['topk'], result['p50_ms'], result['p95_ms'],
+            result['p99_ms'], result['words_per_second'], result['peak_memory_bytes'] / 2 ** 20))
+    for result in report.get('decoding', []):
+        print('beam %-3d accuracy %.3f  p50 %.2fms  p95 %.2fms  p99 %.2fms  %.1f words/s' % (
+            result['beam'], result['accuracy'], result['p50_ms'], result['p95_ms'], result['p99_ms'],
+            result['words_per_second']))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+import argparse
+import codecs
+import json
+import logging
+import os
+import re
+import sys
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from . import ngrams
+from .basic import Model, parse
+
+_logger = logging.getLogger(__name__)
+_tail = re.compile(r'(?<!\w)\w*\Z')
+
+Shard = Tuple[str, int, int]
+
+
+def chunks(filename: str, start: int = 0, end: Optional[int] = None, size: int = 1 << 20) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        remaining = (os.path.getsize(filename) if end is None else end) - start
+        while remaining > 0:
+            block = file.read(min(size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield decoder.decode(block)
+        yield decoder.decode(b'', final=True)
+
+
+def tokenize(texts: Iterable[str]) -> Iterator[str]:
+    carry = ''
+    for text in texts:
+        start = _tail.search(text).start()
+        text, split = carry + text, len(carry) + start if start else 0
+        yield from parse(text[:split])
+        carry = text[split:]
+    yield from parse(carry)
+
+
+def shards(filenames: Iterable[str], size: int = 64 << 20) -> List[Shard]:
+    result = []
+    for filename in filenames:
+        length, start = os.path.getsize(filename), 0
+        with open(filename, 'rb') as file:
+            while start < length:
+                file.seek(min(start + size, length))
+                file.readline()
+                end = min(file.tell(), length)
+                result.append((filename, start, end))
+                start = end
+
+    return result
+
+
+def count(shard: Shard) -> Counter:
+    filename, start, end = shard
+    return Counter(tokenize(chunks(filename, start, end)))
+
+
+def count_grams(shard: Shard, order: int = 3) -> List[Counter]:
+    filename, start, end = shard
+    counters, window = [Counter() for _ in range(order)], deque(maxlen=order)
+    for token in tokenize(chunks(filename, start, end)):
+        window.append(token)
+        gram = tuple(window)
+        counters[0][token] += 1
+        for n in range(2, len(gram) + 1):
+            counters[n - 1][gram[-n:]] += 1
+
+    return counters
+
+
+def build_grams(filenames: Iterable[str], order: int = 3, workers: Optional[int] = None,
+                size: int = 64 << 20) -> List[Counter]:
+    counters = [Counter() for _ in range(order)]
+    with ProcessPoolExecutor(workers) as pool:
+        for future in as_completed([pool.submit(count_grams, shard, order) for shard in shards(filenames, size)]):
+            for counter, found in zip(counters, future.result()):
+                counter.update(found)
+
+    return counters
+
+
+def build(filenames: Iterable[str], model: Optional[Model] = None, workers: Optional[int] = None,
+          size: int = 64 << 20, checkpoint: Optional[str] = None, every: int = 16) -> Model:
+    done = set()
+    if checkpoint and os.path.exists(checkpoint):
+        model = _load(checkpoint)
+        with open(checkpoint + '.done', 'r') as file:
+            done = {tuple(shard) for shard in json.load(file)}
+        _logger.info('Resuming from %s with %d shards done', checkpoint, len(done))
+    model = model or Model(())
+
+    todo = [shard for shard in shards(filenames, size) if shard not in done]
+    with ProcessPoolExecutor(workers) as pool:
+        futures = {pool.submit(count, shard): shard for shard in todo}
+        for i, future in enumerate(as_completed(futures), 1):
+            model.update(future.result())
+            done.add(futures[future])
+            if checkpoint and (i % every == 0 or i == len(futures)):
+                _save(model, done, checkpoint)
+
+    return model
+
+
+def _load(filename: str) -> Model:
+    with open(filename, 'r') as file:
+        return Model(json.load(file))
+
+
+def _save(model: Model, done: Iterable[Shard], checkpoint: str):
+    model.save(checkpoint + '.tmp')
+    with open(checkpoint + '.done.tmp', 'w') as file:
+        json.dump(sorted(done), file)
+    os.replace(checkpoint + '.tmp', checkpoint)
+    os.replace(checkpoint + '.done.tmp', checkpoint + '.done')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='corrector.builder', description='Build a dictionary from text corpora.')
+    parser.add_argument('files', nargs='+', help='text files to count')
+    parser.add_argument('--output', default='words.json', help='dictionary to write')
+    parser.add_argument('--update', action='store_true', help='add the counts to the existing output')
+    parser.add_argument('--workers', type=int, default=None, help='counting processes (default: all cores)')
+    parser.add_argument('--shard', type=int, default=64, help='shard size in MB')
+    parser.add_argument('--checkpoint', help='resumable checkpoint file')
+    parser.add_argument('--every', type=int, default=16, help='shards between checkpoints')
+    parser.add_argument('--lm', help='also write an n-gram language model here')
+    parser.add_argument('--order', type=int, default=3, help='order of the n-gram language model')
+    parser.add_argument('--min-count', type=int, default=1, help='drop words seen fewer times')
+    parser.add_argument('--top', type=int, help='keep only the most frequent words')
+    parser.add_argument('--pattern', help='keep only words matching this regular expression')
+    args = parser.parse_args(argv)
+    if args.lm and not 1 <= args.order <= ngrams.max_order:
+        parser.error('--order must be between 1 and %d' % ngrams.max_order)
+
+    model = _load(args.output) if args.update and os.path.exists(args.output) else None
+    if args.lm:
+        counters = build_grams(args.files, args.order, args.workers, args.shard << 20)
+        ngrams.write(args.lm, counters)
+        if model is None:
+            model = Model(counters[0])
+        else:
+            model.update(counters[0])
+    else:
+        model = build(args.files, model, args.workers, args.shard << 20, args.checkpoint, args.every)
+    if args.min_count > 1 or args.top or args.pattern:
+        model = model.prune(args.min_count, args.top, args.pattern)
+    model.save(args.output)
+    print('Size:', model.size())
+    print('Total:', model.total())
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .basic import Model
+
+_missing = object()
+
+
+class Cache:
+    def __init__(self, size: int = 4096, policy: str = 'lru'):
+        if policy not in ('lru', 'lfu'):
+            raise ValueError('Unknown eviction policy: %s' % policy)
+
+        self._size = size
+        self._policy = policy
+        self._lock = Lock()
+        self._data: OrderedDict = OrderedDict()
+        self._freqs: Dict[int, OrderedDict] = {}
+        self._least = 0
+        self._version: Optional[Hashable] = None
+        self.hits, self.misses, self.evictions, self.invalidations = 0, 0, 0, 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._freqs.clear()
+            self._least = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _missing)
+            if entry is _missing:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            if self._policy == 'lru':
+                self._data.move_to_end(key)
+                return entry
+
+            value, freq = entry
+            self._touch(key, freq)
+            self._data[key] = value, freq + 1
+            return value
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def put(self, key: Hashable, value: Any):
+        if self._size <= 0:
+            return
+
+        with self._lock:
+            if key in self._data:
+                if self._policy == 'lru':
+                    self._data[key] = value
+                    self._data.move_to_end(key)
+                else:
+                    _, freq = self._data[key]
+                    self._touch(key, freq)
+                    self._data[key] = value, freq + 1
+                return
+
+            if len(self._data) >= self._size:
+                self._evict()
+            if self._policy == 'lru':
+                self._data[key] = value
+            else:
+                self._data[key] = value, 1
+                self._freqs.setdefault(1, OrderedDict())[key] = None
+                self._least = 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'size': len(self._data),
+            'capacity': self._size,
+            'policy': self._policy,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hit_rate(),
+        }
+
+    def validate(self, version: Hashable):
+        if version != self._version:
+            if self._version is not None:
+                self.invalidations += 1
+            self.clear()
+            self._version = version
+
+    def _evict(self):
+        if self._policy == 'lru':
+            self._data.popitem(last=False)
+        else:
+            bucket = self._freqs[self._least]
+            key, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self._freqs[self._least]
+            del self._data[key]
+        self.evictions += 1
+
+    def _touch(self, key: Hashable, freq: int):
+        bucket = self._freqs[freq]
+        del bucket[key]
+        if not bucket:
+            del self._freqs[freq]
+            if self._least == freq:
+                self._least = freq + 1
+        self._freqs.setdefault(freq + 1, OrderedDict())[key] = None
+
+
+def cached(func: Callable[..., str], cache: Cache,
+           version: Optional[Callable[[], Hashable]] = None) -> Callable[..., str]:
+    def wrapper(word: str, *args) -> str:
+        cache.validate(_versions(args) if version is None else version())
+        key = (word,) + args
+        result = cache.get(key, _missing)
+        if result is _missing:
+            result = func(word, *args)
+            cache.put(key, result)
+
+        return result
+
+    return wrapper
+
+
+def _versions(args: Tuple) -> Tuple[int, ...]:
+    result = []
+    for arg in args:
+        if isinstance(arg, Model):
+            result.append(arg.version())
+        elif isinstance(arg, (list, tuple)):
+            result.extend(_versions(tuple(arg)))
+
+    return tuple(result)
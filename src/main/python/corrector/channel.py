@@ -0,0 +1,155 @@
+import hashlib
+import math
+import mmap
+import struct
+from array import array
+from collections import Counter
+from typing import Callable, Iterable, List, Tuple
+
+from .basic import Channel
+
+_magic = b'CRCH'
+_header = struct.Struct('<4sIId')
+_kinds = ('del', 'ins', 'sub', 'tra')
+
+Operation = Tuple[str, str, str]
+
+
+def operations(intended: str, typed: str) -> List[Operation]:
+    p = 0
+    while p < len(intended) and p < len(typed) and intended[p] == typed[p]:
+        p += 1
+    s = 0
+    while s < len(intended) - p and s < len(typed) - p and intended[-1 - s] == typed[-1 - s]:
+        s += 1
+    a, b = intended[p:len(intended) - s], typed[p:len(typed) - s]
+    if len(a) == len(b) == 1:
+        return [('sub', a, b)]
+    if not b and len(a) == 1:
+        return [('del', intended[p - 1] if p else '#', a)]
+    if not a and len(b) == 1:
+        return [('ins', intended[p - 1] if p else '#', b)]
+    if len(a) == len(b) == 2 and a == b[::-1]:
+        return [('tra', a[0], a[1])]
+
+    rows = _align(a, b)
+    return _backtrace(rows, a, b, lambda i: intended[p + i - 1] if p + i > 0 else '#')
+
+
+class ConfusionChannel(Channel):
+    @staticmethod
+    def build(pairs: Iterable[Tuple[str, str]], keep: float = 0.975) -> 'ConfusionChannel':
+        pairs = list(pairs)
+        alphabet = sorted({ch for error, correct in pairs for ch in error + correct} - {'#'})
+        counts, chars = Counter(), Counter()
+        for error, correct in pairs:
+            counts.update(operations(correct, error))
+            padded = '#' + correct
+            chars.update(padded)
+            chars.update(padded[i:i + 2] for i in range(len(padded) - 1))
+
+        size = len(alphabet) + 1
+        tables = []
+        for kind in _kinds:
+            table = array('d', [0.0] * (size * size))
+            for x in ['#'] + alphabet:
+                for y in ['#'] + alphabet:
+                    norm = chars[x] if kind in ('ins', 'sub') else chars[x + y]
+                    table[_index(alphabet, x) * size + _index(alphabet, y)] = \
+                        math.log((counts[kind, x, y] + 1) / (norm + size))
+            tables.append(table)
+
+        return ConfusionChannel(alphabet, tables, math.log(keep))
+
+    @staticmethod
+    def load(filename: str) -> 'ConfusionChannel':
+        with open(filename, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, length, size, keep = _header.unpack_from(buffer)
+        if magic != _magic:
+            raise ValueError('Not a confusion channel: %s' % filename)
+
+        start = _header.size + length
+        alphabet = list(buffer[_header.size:start].decode('utf-8'))
+        start += -start % 8
+        view = memoryview(buffer)
+        tables = [view[start + k * 8 * size * size:start + (k + 1) * 8 * size * size].cast('d')
+                  for k in range(len(_kinds))]
+        return ConfusionChannel(alphabet, tables, keep)
+
+    def __init__(self, alphabet: List[str], tables: List[Iterable[float]], keep: float):
+        self._alphabet = alphabet
+        self._positions = {ch: i + 1 for i, ch in enumerate(alphabet)}
+        self._size = len(alphabet) + 1
+        self._tables = dict(zip(_kinds, tables))
+        self._keep = keep
+        self._best = max(max(table) for table in tables)
+
+    def fingerprint(self) -> int:
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(struct.pack('<d', self._keep))
+        digest.update(''.join(self._alphabet).encode('utf-8'))
+        for kind in _kinds:
+            digest.update(array('d', self._tables[kind]).tobytes())
+        return int.from_bytes(digest.digest(), 'little')
+
+    def logprob(self, word: str, candidate: str, dist: int) -> float:
+        if word == candidate:
+            return self._keep
+
+        result = 0.0
+        size, positions = self._size, self._positions
+        for kind, x, y in operations(candidate, word):
+            result += self._tables[kind][positions.get(x, 0) * size + positions.get(y, 0)]
+
+        return result
+
+    def priors(self, word: str, d: int = 2) -> List[float]:
+        return [self._keep] + [i * self._best for i in range(1, d + 1)]
+
+    def save(self, filename: str):
+        alphabet = ''.join(self._alphabet).encode('utf-8')
+        with open(filename, 'wb') as file:
+            file.write(_header.pack(_magic, len(alphabet), self._size, self._keep))
+            file.write(alphabet)
+            file.write(b'\0' * (-(_header.size + len(alphabet)) % 8))
+            for kind in _kinds:
+                file.write(array('d', self._tables[kind]).tobytes())
+
+
+def _align(a: str, b: str) -> List[List[int]]:
+    rows = [[j for j in range(len(b) + 1)]]
+    for i in range(1, len(a) + 1):
+        row = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            row[j] = min(rows[i - 1][j] + 1, row[j - 1] + 1, rows[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], rows[i - 2][j - 2] + 1)
+        rows.append(row)
+
+    return rows
+
+
+def _backtrace(rows: List[List[int]], a: str, b: str, context: Callable[[int], str]) -> List[Operation]:
+    result, i, j = [], len(a), len(b)
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and rows[i][j] == rows[i - 1][j - 1] + (a[i - 1] != b[j - 1]):
+            if a[i - 1] != b[j - 1]:
+                result.append(('sub', a[i - 1], b[j - 1]))
+            i, j = i - 1, j - 1
+        elif i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1] and rows[i][j] == rows[i - 2][j - 2] + 1:
+            result.append(('tra', a[i - 2], a[i - 1]))
+            i, j = i - 2, j - 2
+        elif i > 0 and rows[i][j] == rows[i - 1][j] + 1:
+            result.append(('del', context(i - 1), a[i - 1]))
+            i -= 1
+        else:
+            result.append(('ins', context(i), b[j - 1]))
+            j -= 1
+
+    return result[::-1]
+
+
+def _index(alphabet: List[str], ch: str) -> int:
+    return 0 if ch == '#' else alphabet.index(ch) + 1
@@ -0,0 +1,159 @@
+import heapq
+import mmap
+import struct
+from array import array
+from operator import itemgetter
+from typing import Hashable, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+_magic = b'CRC1'
+_header = struct.Struct('<4sIQ')
+
+
+def pack(items: Iterable[Tuple[Hashable, int]]) -> bytes:
+    items = sorted((str(k).encode('utf-8'), v) for k, v in items)
+    counts, offsets, blob = array('Q'), array('I', [0]), bytearray()
+    for key, value in items:
+        blob += key
+        counts.append(value)
+        offsets.append(len(blob))
+
+    return _header.pack(_magic, len(items), len(blob)) + counts.tobytes() + offsets.tobytes() + bytes(blob)
+
+
+def write(filename: str, items: Iterable[Tuple[Hashable, int]]):
+    with open(filename, 'wb') as file:
+        file.write(pack(items))
+
+
+class Counts:
+    def __init__(self, filename: str, offset: int = 0):
+        self._filename = filename
+        self._offset = offset
+        with open(filename, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._size, length = _header.unpack_from(self._mmap, offset)
+        if magic != _magic:
+            raise ValueError('Not a compact dictionary: %s' % filename)
+
+        view = memoryview(self._mmap)
+        start = offset + _header.size
+        self._counts = view[start:start + 8 * self._size].cast('Q')
+        start += 8 * self._size
+        self._offsets = view[start:start + 4 * (self._size + 1)].cast('I')
+        self._start = start + 4 * (self._size + 1)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._find(key) >= 0
+
+    def __getitem__(self, key: Hashable) -> int:
+        i = self._find(key)
+        return self._counts[i] if i >= 0 else 0
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._key(i) for i in range(self._size))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __reduce__(self):
+        return Counts, (self._filename, self._offset)
+
+    def following(self, prefix: str) -> Optional[str]:
+        head = prefix.encode('utf-8')
+        lo, hi = self._lower(head), self._lower(head + b'\xff')
+        if lo == hi:
+            return None
+
+        result = []
+        while lo < hi:
+            rest = self._key(lo)[len(prefix):]
+            if rest:
+                result.append(rest[0])
+                lo = self._lower((prefix + rest[0]).encode('utf-8') + b'\xff', lo, hi)
+            else:
+                lo += 1
+
+        return ''.join(result)
+
+    def get(self, key: Hashable, default: Optional[int] = None) -> Optional[int]:
+        i = self._find(key)
+        return self._counts[i] if i >= 0 else default
+
+    def index(self, key: Hashable) -> int:
+        return self._find(key)
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        return ((self._key(i), self._counts[i]) for i in range(self._size))
+
+    def key(self, i: int) -> str:
+        return self._key(i)
+
+    def keys(self) -> Iterator[str]:
+        return iter(self)
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        if n is None:
+            return sorted(self.items(), key=itemgetter(1), reverse=True)
+
+        return heapq.nlargest(n, self.items(), key=itemgetter(1))
+
+    def values(self) -> Iterable[int]:
+        return self._counts
+
+    def _find(self, key: Hashable) -> int:
+        if not isinstance(key, str):
+            return -1
+
+        target = key.encode('utf-8')
+        i = self._lower(target)
+        return i if i < self._size and self._probe(i) == target else -1
+
+    def _key(self, i: int) -> str:
+        return self._probe(i).decode('utf-8')
+
+    def _lower(self, target: bytes, lo: int = 0, hi: Optional[int] = None) -> int:
+        hi = self._size if hi is None else hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._probe(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return lo
+
+    def _probe(self, i: int) -> bytes:
+        return self._mmap[self._start + self._offsets[i]:self._start + self._offsets[i + 1]]
+
+
+class Prefixes(Mapping):
+    def __init__(self, counts: Counts):
+        self._counts = counts
+
+    def __getitem__(self, prefix: str) -> str:
+        result = self.get(prefix)
+        if result is None:
+            raise KeyError(prefix)
+
+        return result
+
+    def __iter__(self) -> Iterator[str]:
+        previous = None
+        for key in self._counts:
+            start = 0
+            if previous is None:
+                yield ''
+            else:
+                while start < min(len(key), len(previous)) and key[start] == previous[start]:
+                    start += 1
+            for i in range(start + 1, len(key) + 1):
+                yield key[:i]
+            previous = key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def get(self, prefix: str, default: Optional[str] = None) -> Optional[str]:
+        result = self._counts.following(prefix) if isinstance(prefix, str) else None
+        return default if result is None else result
@@ -0,0 +1,49 @@
+import heapq
+from operator import itemgetter
+from typing import List, Optional, Sequence, Tuple, Union
+
+from .basic import Channel, DistanceChannel, Engine, Model, candidates
+from .ngrams import NGrams
+
+Option = Tuple[str, float]
+
+
+def lattice(tokens: Sequence[str], dictionary: Model, errors: Union[Model, Channel], d: int = 2,
+            engine: Optional[Engine] = None, width: int = 16) -> List[List[Option]]:
+    channel = errors if isinstance(errors, Channel) else DistanceChannel(errors)
+    result = []
+    for token in tokens:
+        reach = min(d, 1) if token in dictionary else d
+        options = [(candidate, channel.logprob(token, candidate, dist))
+                   for dist, hits in candidates(token, dictionary, reach, engine) for candidate in hits]
+        options = heapq.nlargest(width, options, key=lambda x: x[1] + dictionary.logprob(x[0]))
+        result.append(options or [(token, 0.0)])
+
+    return result
+
+
+def decode(tokens: Sequence[str], lm: NGrams, dictionary: Model, errors: Union[Model, Channel], d: int = 2,
+           engine: Optional[Engine] = None, beam: int = 4, width: int = 16) -> List[str]:
+    history = lm.order() - 1
+    hypotheses = [(0.0, (), None)]
+    for options in lattice(tokens, dictionary, errors, d, engine, width):
+        states = {}
+        for score, state, path in hypotheses:
+            for candidate, prior in options:
+                total = score + prior + lm.logprob(candidate, state)
+                following = (state + (candidate,))[-history:] if history else ()
+                if following not in states or total > states[following][0]:
+                    states[following] = (total, following, (candidate, path))
+        hypotheses = heapq.nlargest(beam, states.values(), key=itemgetter(0))
+
+    result, path = [], max(hypotheses, key=itemgetter(0))[2]
+    while path is not None:
+        result.append(path[0])
+        path = path[1]
+
+    return result[::-1]
+
+
+def review(text: str, lm: NGrams, dictionary: Model, errors: Union[Model, Channel], d: int = 2,
+           engine: Optional[Engine] = None, beam: int = 4, width: int = 16) -> str:
+    return ' '.join(decode(text.split(), lm, dictionary, errors, d, engine, beam, width))
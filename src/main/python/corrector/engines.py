@@ -0,0 +1,60 @@
+import logging
+import re
+from typing import Callable, Iterable, Iterator, Mapping, Optional, Union
+
+from .basic import Channel, Engine, Model
+
+_logger = logging.getLogger(__name__)
+
+names = ('edits', 'scan', 'symspell', 'trie', 'vector')
+pattern = re.compile(r'(?<!\w)[^\W\d_]+(?!\w)')
+
+
+def create(name: str, dictionary: Model, d: int = 2) -> Optional[Engine]:
+    if name == 'scan':
+        from .scan import Scan
+        return Scan(dictionary)
+    if name == 'symspell':
+        from .symspell import SymSpell
+        return SymSpell(dictionary, d)
+    if name == 'trie':
+        from .trie import Trie
+        return Trie(dictionary)
+    if name == 'vector':
+        from .vector import VectorEngine
+        return VectorEngine(dictionary)
+    if name != 'edits':
+        raise ValueError('Unknown engine: %s' % name)
+
+    return None
+
+
+def load_table(filename: str, dictionary: Model, errors: Union[Model, Channel],
+               d: int = 2) -> Optional[Mapping[str, str]]:
+    from .table import Table
+
+    table = Table(filename)
+    if not table.matches(dictionary, errors, d):
+        _logger.warning('Ignoring %s: built for a different dictionary, error model or distance', filename)
+        return None
+
+    return table
+
+
+def amend(lines: Iterable[str], dictionary: Model, fix: Callable[[str], str]) -> Iterator[str]:
+    def replace(match) -> str:
+        word = match.group(0)
+        lower = word.lower()
+        return word if lower in dictionary else _restore(word, fix(lower))
+
+    for line in lines:
+        yield pattern.sub(replace, line)
+
+
+def _restore(original: str, corrected: str) -> str:
+    if original.isupper() and len(original) > 1:
+        return corrected.upper()
+    if original[:1].isupper():
+        return corrected[:1].upper() + corrected[1:]
+
+    return corrected
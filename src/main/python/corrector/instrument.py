@@ -0,0 +1,100 @@
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Callable, Counter, Dict, Iterator, List, Optional
+
+from . import basic
+from .cache import Cache
+
+Hook = Callable[[Dict[str, Any]], None]
+
+_hooks: List[Hook] = []
+_lock = Lock()
+
+
+class Stats:
+    def __init__(self):
+        self._lock = Lock()
+        self._counts: Counter[str] = Counter()
+        self._times: Counter[str] = Counter()
+        self._lengths: Counter[int] = Counter()
+        self._caches: Dict[str, Cache] = {}
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self._counts[name] += n
+
+    def length(self, n: int):
+        with self._lock:
+            self._lengths[n] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self._times.clear()
+            self._lengths.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            words = sum(self._lengths.values())
+            return {
+                'counts': dict(self._counts),
+                'times': dict(self._times),
+                'lengths': dict(sorted(self._lengths.items())),
+                'mean_length': sum(n * c for n, c in self._lengths.items()) / words if words else 0.0,
+                'caches': {name: dict(cache.stats(), hit_rate=cache.hit_rate())
+                           for name, cache in self._caches.items()},
+            }
+
+    def time(self, name: str, seconds: float):
+        with self._lock:
+            self._times[name] += seconds
+
+    def watch(self, name: str, cache: Cache):
+        with self._lock:
+            self._caches[name] = cache
+
+
+def active() -> Optional[Stats]:
+    return basic._stats
+
+
+def disable():
+    basic._stats = None
+
+
+def enable(stats: Optional[Stats] = None) -> Stats:
+    basic._stats = stats = stats or Stats()
+    return stats
+
+
+def publish(stats: Optional[Stats] = None):
+    stats = stats or active()
+    if stats is None:
+        return
+
+    with _lock:
+        hooks = list(_hooks)
+    snapshot = stats.snapshot()
+    for hook in hooks:
+        hook(snapshot)
+
+
+def register(hook: Hook):
+    with _lock:
+        _hooks.append(hook)
+
+
+def unregister(hook: Hook):
+    with _lock:
+        _hooks.remove(hook)
+
+
+@contextmanager
+def profile(stats: Optional[Stats] = None) -> Iterator[Stats]:
+    previous = basic._stats
+    stats = enable(stats)
+    try:
+        yield stats
+    finally:
+        basic._stats = previous
+        publish(stats)
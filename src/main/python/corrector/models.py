@@ -0,0 +1,67 @@
+import os
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable
+
+from .basic import Model, parse
+
+_folder = os.path.abspath(os.path.dirname(__file__))
+_lock = Lock()
+_factories: Dict[str, Callable[[], Any]] = {}
+_locks: Dict[str, Lock] = {}
+_models: Dict[str, Any] = {}
+
+
+def register(name: str, factory: Callable[[], Any], replace: bool = False):
+    with _lock:
+        if name in _factories and not replace:
+            raise ValueError('Model already registered: %s' % name)
+
+        _factories[name] = factory
+        _locks.setdefault(name, Lock())
+        _models.pop(name, None)
+
+
+def get(name: str) -> Any:
+    try:
+        return _models[name]
+    except KeyError:
+        pass
+
+    with _lock:
+        if name not in _factories:
+            raise KeyError('Unknown model: %s' % name)
+        lock = _locks[name]
+
+    with lock:
+        if name not in _models:
+            _models[name] = _factories[name]()
+
+        return _models[name]
+
+
+def loaded(name: str) -> bool:
+    return name in _models
+
+
+def available() -> Iterable[str]:
+    return list(_factories)
+
+
+def preload(*names: str):
+    for name in names or list(_factories):
+        get(name)
+
+
+def unload(name: str):
+    with _lock:
+        _models.pop(name, None)
+
+
+def _content() -> Model:
+    with open(os.path.join(_folder, 'content.txt'), 'r') as file:
+        return Model(parse(file.read()))
+
+
+register('words', lambda: Model.load(os.path.join(_folder, 'words.json')))
+register('errors', lambda: Model.load(os.path.join(_folder, 'errors.json')))
+register('content', _content)
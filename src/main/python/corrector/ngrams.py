@@ -0,0 +1,110 @@
+import math
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import List, Sequence, Tuple
+
+from .compact import Counts, pack
+
+_magic = b'CRNG'
+_header = struct.Struct('<4sIQ')
+_bits = 21
+max_order = 64 // _bits
+_backoff = math.log(0.4)
+
+
+def write(filename: str, counters: List[Counter]):
+    if len(counters) > max_order:
+        raise ValueError('Order %d does not fit in 64-bit keys (at most %d)' % (len(counters), max_order))
+
+    vocabulary = pack(counters[0].items())
+    ids = {word: i for i, word in enumerate(sorted(counters[0], key=lambda w: str(w).encode('utf-8')))}
+    if len(ids) >= 1 << _bits:
+        raise ValueError('Vocabulary too large: %d words' % len(ids))
+
+    tables = []
+    for counter in counters[1:]:
+        keys, counts = array('Q'), array('Q')
+        for key, value in sorted((_key(ids[w] for w in gram), v) for gram, v in counter.items()
+                                 if all(w in ids for w in gram)):
+            keys.append(key)
+            counts.append(value)
+        tables.append((keys, counts))
+
+    with open(filename, 'wb') as file:
+        head = _header.pack(_magic, len(counters), len(vocabulary)) + struct.pack('<%dQ' % len(tables),
+                                                                                  *[len(k) for k, _ in tables])
+        file.write(head + b'\0' * (-len(head) % 8))
+        file.write(vocabulary + b'\0' * (-len(vocabulary) % 8))
+        for keys, counts in tables:
+            file.write(keys.tobytes())
+            file.write(counts.tobytes())
+
+
+class NGrams:
+    def __init__(self, filename: str):
+        with open(filename, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._order, length = _header.unpack_from(self._mmap)
+        if magic != _magic:
+            raise ValueError('Not an n-gram model: %s' % filename)
+
+        sizes = struct.unpack_from('<%dQ' % (self._order - 1), self._mmap, _header.size)
+        start = _header.size + 8 * len(sizes)
+        start += -start % 8
+        self._vocabulary = Counts(filename, start)
+        start += length + (-length % 8)
+
+        view = memoryview(self._mmap)
+        self._tables: List[Tuple[Sequence[int], Sequence[int]]] = []
+        for size in sizes:
+            keys = view[start:start + 8 * size].cast('Q')
+            counts = view[start + 8 * size:start + 16 * size].cast('Q')
+            self._tables.append((keys, counts))
+            start += 16 * size
+
+        self._total = sum(self._vocabulary.values())
+        self._floor = math.log(0.5 / max(self._total, 1))
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._vocabulary
+
+    def count(self, gram: Sequence[str]) -> int:
+        if len(gram) == 1:
+            return self._vocabulary[gram[0]]
+
+        ids = [self._vocabulary.index(word) for word in gram]
+        if len(gram) > self._order or min(ids) < 0:
+            return 0
+
+        keys, counts = self._tables[len(gram) - 2]
+        key = _key(ids)
+        i = bisect_left(keys, key)
+        return counts[i] if i < len(keys) and keys[i] == key else 0
+
+    def logprob(self, word: str, context: Sequence[str] = ()) -> float:
+        context = tuple(context[1 - self._order:]) if self._order > 1 else ()
+        penalty = 0.0
+        while context:
+            found = self.count(context + (word,))
+            if found:
+                return penalty + math.log(found) - math.log(self.count(context))
+            context = context[1:]
+            penalty += _backoff
+
+        found = self._vocabulary[word]
+        return penalty + (math.log(found / self._total) if found else self._floor)
+
+    def order(self) -> int:
+        return self._order
+
+
+def _key(ids) -> int:
+    key = 0
+    for i in ids:
+        key = (key << _bits) | i
+
+    return key
@@ -1,5 +1,12 @@
+import heapq
+import os
 import re
-from collections import Counter
+
+from . import models
+from .basic import Model, edits, hopeless, viable_edits
+
+_folder = os.path.abspath(os.path.dirname(__file__))
+_letters = 'abcdefghijklmnopqrstuvwxyz'
 
 
 def words(text):
@@ -9,12 +16,25 @@ def words(text):
                       r'\b[a-z]+\b', text.lower())
 
 
-WORDS = Counter(words(open('content.txt').read()))
+def _load():
+    with open(os.path.join(_folder, 'content.txt')) as file:
+        return Model(words(file.read()))
+
+
+models.register('norvig', _load, replace=True)
+
 
+def __getattr__(name):
+    if name == 'WORDS':
+        return models.get('norvig')
 
-def P(word, N=sum(WORDS.values())):
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def P(word, N=None):
     "Probability of `word`."
-    return WORDS[word] / N
+    WORDS = models.get('norvig')
+    return WORDS.freq(word) / (N or WORDS.total())
 
 
 def correction(word):
@@ -22,6 +42,11 @@ def correction(word):
     return max(candidates(word), key=P)
 
 
+def suggestions(word, k=5):
+    "The `k` most probable spelling corrections for word, with their probabilities."
+    return [(w, P(w)) for w in heapq.nlargest(k, candidates(word), key=P)]
+
+
 def candidates(word):
     "Generate possible spelling corrections for word."
     return known([word]) or known(edits1(word)) or known(edits2(word)) or [word]
@@ -29,23 +54,19 @@ def candidates(word):
 
 def known(words):
     "The subset of `words` that appear in the dictionary of WORDS."
-    return set(w for w in words if w in WORDS)
+    return models.get('norvig').filter(words)
 
 
 def edits1(word):
     "All edits that are one edit away from `word`."
-    letters = 'abcdefghijklmnopqrstuvwxyz'
-    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
-    deletes = [L + R[1:] for L, R in splits if R]
-    transposes = [L + R[1] + R[0] + R[2:] for L, R in splits if len(R) > 1]
-    replaces = [L + c + R[1:] for L, R in splits if R for c in letters]
-    inserts = [L + c + R for L, R in splits for c in letters]
-    return set(deletes + transposes + replaces + inserts)
+    return set(edits(word, _letters))
 
 
 def edits2(word):
-    "All edits that are two edits away from `word`."
-    return (e2 for e1 in edits1(word) for e2 in edits1(e1))
+    "The edits two edits away from `word` that may still be in the dictionary of WORDS."
+    WORDS = models.get('norvig')
+    prefixes, bigrams = WORDS.prefixes(), WORDS.bigrams()
+    return (e2 for e1 in edits1(word) if not hopeless(e1, bigrams) for e2 in viable_edits(e1, prefixes, _letters))
 
 
 def review(text: str) -> str:
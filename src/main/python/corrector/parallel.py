@@ -0,0 +1,45 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+from . import basic
+from .basic import Engine, Model
+
+_dictionary: Optional[Model] = None
+_errors: Optional[Model] = None
+_engine: Optional[Engine] = None
+_d = 2
+
+
+def initialize(dictionary: Model, errors: Model, d: int, engine: Optional[Engine]):
+    global _dictionary, _errors, _d, _engine
+    _dictionary, _errors, _d, _engine = dictionary, errors, d, engine
+
+
+def correct_all(words: List[str]) -> List[str]:
+    return basic.correct_batch(words, _dictionary, _errors, _d, _engine)
+
+
+def correct_batch(tokens: Iterable[str], dictionary: Model, errors: Model, d: int = 2,
+                  engine: Optional[Engine] = None, workers: Optional[int] = None) -> List[str]:
+    tokens = list(tokens)
+    unknown = list({token for token in tokens if token not in dictionary})
+    corrections = {}
+    if unknown:
+        workers = workers or os.cpu_count() or 1
+        size = max(1, -(-len(unknown) // (workers * 4)))
+        chunks = [unknown[i:i + size] for i in range(0, len(unknown), size)]
+        with ProcessPoolExecutor(workers, initializer=initialize, initargs=(dictionary, errors, d, engine)) as pool:
+            for chunk, result in zip(chunks, pool.map(correct_all, chunks)):
+                corrections.update(zip(chunk, result))
+
+    return [corrections.get(token, token) for token in tokens]
+
+
+def review_many(texts: Iterable[str], dictionary: Model, errors: Model, d: int = 2,
+                engine: Optional[Engine] = None, workers: Optional[int] = None) -> List[str]:
+    texts = [text.split() for text in texts]
+    unique = list({token for tokens in texts for token in tokens})
+    corrections = dict(zip(unique, correct_batch(unique, dictionary, errors, d, engine, workers)))
+
+    return [' '.join(corrections[token] for token in tokens) for tokens in texts]
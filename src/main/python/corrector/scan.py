@@ -0,0 +1,20 @@
+from typing import List, Tuple
+
+from .basic import Engine, Model, characters, distance
+
+
+class Scan(Engine):
+    def __init__(self, dictionary: Model):
+        self._dictionary = dictionary
+
+    def search(self, word: str, d: int = 2) -> List[Tuple[str, int]]:
+        result = []
+        for candidate in self._dictionary.near(word, d):
+            dist = distance(word, candidate, d, characters)
+            if dist <= d:
+                result.append((candidate, dist))
+
+        return result
+
+    def size(self) -> int:
+        return self._dictionary.size()
@@ -0,0 +1,272 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Deque, Dict, List, Mapping, NamedTuple, Optional
+
+from . import parallel
+from .basic import Engine, Model
+from .channel import ConfusionChannel
+from .engines import amend, create, load_table, names, pattern
+
+_folder = os.path.abspath(os.path.dirname(__file__))
+_logger = logging.getLogger(__name__)
+
+
+class _Request(NamedTuple):
+    text: str
+    words: List[str]
+    future: asyncio.Future
+    start: float
+
+
+def _percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+class Server:
+    def __init__(self, dictionary: Model, errors: Model, d: int = 2, engine: Optional[Engine] = None,
+                 workers: Optional[int] = None, window: float = 0.005, size: int = 256, budget: float = 0.1,
+                 history: int = 4096, table: Optional[Mapping[str, str]] = None):
+        self._dictionary = dictionary
+        self._table = table
+        self._errors = errors
+        self._d = d
+        self._engine = engine
+        self._workers = (os.cpu_count() or 1) if workers is None else workers
+        self._window = window
+        self._size = size
+        self._budget = budget
+        self._pool: Optional[Executor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._latencies: Deque[float] = deque(maxlen=history)
+        self._cost = 0.0
+        self._requests = 0
+        self._batches = 0
+        self._batched = 0
+        self._tokens = 0
+        self._unique = 0
+        self._errors_seen = 0
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765, path: Optional[str] = None):
+        if self._workers:
+            self._pool = ProcessPoolExecutor(self._workers, initializer=parallel.initialize,
+                                             initargs=(self._dictionary, self._errors, self._d, self._engine))
+        else:
+            parallel.initialize(self._dictionary, self._errors, self._d, self._engine)
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self._run())
+        if path:
+            self._server = await asyncio.start_unix_server(self._handle, path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        if self._pool:
+            self._pool.shutdown()
+
+    async def correct(self, text: str) -> str:
+        loop = asyncio.get_running_loop()
+        words = [word for word in (match.group(0).lower() for match in pattern.finditer(text))
+                 if word not in self._dictionary]
+        if self._table is not None:
+            words = [word for word in words if word not in self._table]
+        request = _Request(text, words, loop.create_future(), loop.time())
+        self._requests += 1
+        if not words:
+            self._latencies.append(loop.time() - request.start)
+            return next(amend([text], self._dictionary, self._table.__getitem__)) if self._table else text
+
+        await self._queue.put(request)
+        return await request.future
+
+    def metrics(self) -> Dict[str, float]:
+        latencies = list(self._latencies)
+        return {
+            'queue': self._queue.qsize() if self._queue else 0,
+            'requests': self._requests,
+            'batches': self._batches,
+            'batch': self._batched / self._batches if self._batches else 0.0,
+            'tokens': self._tokens,
+            'unique': self._unique,
+            'errors': self._errors_seen,
+            'cost_us': self._cost * 1e6,
+            'p50_ms': _percentile(latencies, 50) * 1e3,
+            'p95_ms': _percentile(latencies, 95) * 1e3,
+            'p99_ms': _percentile(latencies, 99) * 1e3,
+            'window_ms': self._window * 1e3,
+            'budget_ms': self._budget * 1e3,
+        }
+
+    async def _collect(self) -> List[_Request]:
+        loop = asyncio.get_running_loop()
+        first = await self._queue.get()
+        batch, tokens = [first], len(first.words)
+        while len(batch) < self._size:
+            deadline = min(first.start + self._window, first.start + self._budget - self._cost * tokens)
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                request = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(request)
+            tokens += len(request.words)
+
+        while len(batch) < self._size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        return batch
+
+    async def _dispatch(self, words: List[str]) -> Dict[str, str]:
+        loop = asyncio.get_running_loop()
+        parts = max(1, min(self._workers, len(words)))
+        chunks = [words[i::parts] for i in range(parts)]
+        results = await asyncio.gather(*[loop.run_in_executor(self._pool, parallel.correct_all, chunk)
+                                         for chunk in chunks])
+        corrections = {}
+        for chunk, result in zip(chunks, results):
+            corrections.update(zip(chunk, result))
+
+        return corrections
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        pending: asyncio.Queue = asyncio.Queue()
+
+        async def respond():
+            while True:
+                task = await pending.get()
+                if task is None:
+                    break
+                line = await task
+                writer.write(line.encode('utf-8'))
+                await writer.drain()
+
+        responder = asyncio.ensure_future(respond())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                await pending.put(asyncio.ensure_future(self._reply(line.decode('utf-8', 'replace'))))
+        finally:
+            await pending.put(None)
+            try:
+                await responder
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+            writer.close()
+
+    async def _reply(self, line: str) -> str:
+        if line.rstrip('\r\n') == ':metrics':
+            return json.dumps(self.metrics()) + '\n'
+
+        try:
+            text = await self.correct(line)
+        except Exception:
+            _logger.exception('Failed to correct %r', line)
+            text = line
+
+        return text if text.endswith('\n') else text + '\n'
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            words = list({word for request in batch for word in request.words})
+            self._batches += 1
+            self._batched += len(batch)
+            self._tokens += sum(len(request.words) for request in batch)
+            self._unique += len(words)
+            started = loop.time()
+            try:
+                corrections = await self._dispatch(words)
+            except Exception as e:
+                self._errors_seen += len(batch)
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+
+            elapsed = loop.time() - started
+            self._cost = 0.8 * self._cost + 0.2 * elapsed / len(words) if self._cost else elapsed / len(words)
+            finished = loop.time()
+            fix = corrections.__getitem__ if self._table is None else \
+                (lambda word: corrections[word] if word in corrections else self._table[word])
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_result(next(amend([request.text], self._dictionary, fix)))
+                self._latencies.append(finished - request.start)
+
+
+async def _serve(server: Server, host: str, port: int, path: Optional[str]):
+    await server.start(host, port, path)
+    _logger.info('Listening on %s', path or '%s:%d' % (host, port))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='corrector.server', description='Serve spelling corrections over a socket.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=8765, help='port to listen on')
+    parser.add_argument('--unix', help='listen on a unix socket instead of tcp')
+    parser.add_argument('--dictionary', default=os.path.join(_folder, 'words.json'), help='dictionary model')
+    parser.add_argument('--errors', default=os.path.join(_folder, 'errors.json'), help='error model')
+    parser.add_argument('--channel', help='confusion channel built by convertor (replaces --errors)')
+    parser.add_argument('-d', '--distance', type=int, default=2, help='maximum edit distance')
+    parser.add_argument('--engine', choices=names, default='edits',
+                        help='candidate search')
+    parser.add_argument('--table', help='precomputed correction table built by corrector.table')
+    parser.add_argument('--workers', type=int, help='worker processes (0 corrects in a thread of the server)')
+    parser.add_argument('--window', type=float, default=5, help='batching window in milliseconds')
+    parser.add_argument('--batch', type=int, default=256, help='maximum requests per batch')
+    parser.add_argument('--budget', type=float, default=100, help='latency budget in milliseconds')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.dictionary.endswith('.json'):
+        dictionary = Model.load(args.dictionary)
+    else:
+        dictionary = Model.load_compact(args.dictionary)
+    if args.channel:
+        errors = ConfusionChannel.load(args.channel)
+    else:
+        errors = Model.load(args.errors)
+    engine = create(args.engine, dictionary, args.distance)
+
+    table = load_table(args.table, dictionary, errors, args.distance) if args.table else None
+    server = Server(dictionary, errors, args.distance, engine, args.workers,
+                    args.window / 1e3, args.batch, args.budget / 1e3, table=table)
+    try:
+        asyncio.run(_serve(server, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
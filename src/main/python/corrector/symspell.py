@@ -0,0 +1,41 @@
+from typing import Dict, List, Set, Tuple
+
+from .basic import Engine, Model, characters, distance
+
+
+def deletes(word: str, d: int = 1) -> Set[str]:
+    result, level = {word}, {word}
+    for _ in range(d):
+        level = {e[:i] + e[i + 1:] for e in level for i in range(len(e))}
+        result |= level
+
+    return result
+
+
+class SymSpell(Engine):
+    def __init__(self, dictionary: Model, d: int = 2):
+        self._d = d
+        self._index: Dict[str, List[str]] = {}
+        for word in dictionary.keys():
+            if not isinstance(word, str):
+                continue
+            for variant in deletes(word, d):
+                self._index.setdefault(variant, []).append(word)
+
+    def search(self, word: str, d: int = 2) -> List[Tuple[str, int]]:
+        if d > self._d:
+            raise ValueError('Index built for distance %d, cannot search distance %d' % (self._d, d))
+
+        result, seen = [], set()
+        for variant in deletes(word, d):
+            for candidate in self._index.get(variant, ()):
+                if candidate not in seen:
+                    seen.add(candidate)
+                    dist = distance(word, candidate, d, characters)
+                    if dist <= d:
+                        result.append((candidate, dist))
+
+        return result
+
+    def size(self) -> int:
+        return len(self._index)
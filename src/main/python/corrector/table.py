@@ -0,0 +1,133 @@
+import argparse
+import hashlib
+import logging
+import os
+import struct
+import sys
+from typing import Dict, Iterable, List, Mapping, Optional, Union
+
+from .basic import Channel, DistanceChannel, Engine, Model, correct_batch
+from .channel import ConfusionChannel
+from .compact import Counts, pack
+from .engines import create, names
+
+_folder = os.path.abspath(os.path.dirname(__file__))
+_logger = logging.getLogger(__name__)
+_magic = b'CRTB'
+_header = struct.Struct('<4sQQ')
+
+
+def version(dictionary: Model, errors: Union[Model, Channel], d: int = 2) -> int:
+    channel = errors if isinstance(errors, Channel) else DistanceChannel(errors)
+    digest = hashlib.blake2b(struct.pack('<QQI', dictionary.fingerprint(), channel.fingerprint(), d), digest_size=8)
+    return int.from_bytes(digest.digest(), 'little')
+
+
+def build(words: Iterable[str], dictionary: Model, errors: Union[Model, Channel], d: int = 2,
+          engine: Optional[Engine] = None, workers: Optional[int] = None) -> Dict[str, str]:
+    unknown = sorted({word for word in words if word not in dictionary})
+    if workers:
+        from . import parallel
+        corrections = parallel.correct_batch(unknown, dictionary, errors, d, engine, workers)
+    else:
+        corrections = correct_batch(unknown, dictionary, errors, d, engine)
+
+    return dict(zip(unknown, corrections))
+
+
+def write(filename: str, corrections: Mapping[str, str], stamp: int):
+    targets = sorted(set(corrections.values()), key=lambda word: word.encode('utf-8'))
+    ids = {word: i for i, word in enumerate(targets)}
+    misspellings = pack((word, ids[target]) for word, target in corrections.items())
+
+    with open(filename, 'wb') as file:
+        file.write(_header.pack(_magic, stamp, len(misspellings)))
+        file.write(misspellings + b'\0' * (-len(misspellings) % 8))
+        file.write(pack((word, 0) for word in targets))
+
+
+class Table:
+    def __init__(self, filename: str):
+        with open(filename, 'rb') as file:
+            magic, self._version, length = _header.unpack(file.read(_header.size))
+        if magic != _magic:
+            raise ValueError('Not a correction table: %s' % filename)
+
+        self._misspellings = Counts(filename, _header.size)
+        self._corrections = Counts(filename, _header.size + length + (-length % 8))
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._misspellings
+
+    def __getitem__(self, word: str) -> str:
+        i = self._misspellings.get(word)
+        if i is None:
+            raise KeyError(word)
+
+        return self._corrections.key(i)
+
+    def __len__(self) -> int:
+        return len(self._misspellings)
+
+    def get(self, word: str, default: Optional[str] = None) -> Optional[str]:
+        i = self._misspellings.get(word)
+        return self._corrections.key(i) if i is not None else default
+
+    def matches(self, dictionary: Model, errors: Union[Model, Channel], d: int = 2) -> bool:
+        return self._version == version(dictionary, errors, d)
+
+    def version(self) -> int:
+        return self._version
+
+
+def _words(filenames: List[str], sources: Optional[List[str]]) -> Iterable[str]:
+    if sources != []:
+        from .convertor import rows
+        for row in rows(sources):
+            if ' ' not in row['error']:
+                yield row['error'].lower()
+
+    for filename in filenames:
+        with open(filename, 'r', encoding='utf-8') as file:
+            for line in file:
+                word = line.split('\t', 1)[0].strip().lower()
+                if word:
+                    yield word
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='corrector.table',
+                                     description='Precompute corrections for known misspellings.')
+    parser.add_argument('--output', default=os.path.join(_folder, 'table.bin'), help='table to write')
+    parser.add_argument('--extra', nargs='*', default=[], help='files with one misspelling per line')
+    parser.add_argument('--sources', help='comma separated convertor sources (default: all, "" for none)')
+    parser.add_argument('--dictionary', default=os.path.join(_folder, 'words.json'), help='dictionary model')
+    parser.add_argument('--errors', default=os.path.join(_folder, 'errors.json'), help='error model')
+    parser.add_argument('--channel', help='confusion channel built by convertor (replaces --errors)')
+    parser.add_argument('-d', '--distance', type=int, default=2, help='maximum edit distance')
+    parser.add_argument('--engine', choices=names, default='edits',
+                        help='candidate search')
+    parser.add_argument('--workers', type=int, help='worker processes')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.dictionary.endswith('.json'):
+        dictionary = Model.load(args.dictionary)
+    else:
+        dictionary = Model.load_compact(args.dictionary)
+    if args.channel:
+        errors = ConfusionChannel.load(args.channel)
+    else:
+        errors = Model.load(args.errors)
+    engine = create(args.engine, dictionary, args.distance)
+
+    sources = None if args.sources is None else [name for name in args.sources.split(',') if name]
+    corrections = build(_words(args.extra, sources), dictionary, errors, args.distance, engine, args.workers)
+    write(args.output, corrections, version(dictionary, errors, args.distance))
+    _logger.info('Wrote %d corrections to %s', len(corrections), args.output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+from typing import Dict, List, Optional, Tuple
+
+from .basic import Engine, Model, characters, distance
+
+
+class Node:
+    __slots__ = ('children', 'word')
+
+    def __init__(self):
+        self.children: Dict[str, Node] = {}
+        self.word: Optional[str] = None
+
+
+class Trie(Engine):
+    def __init__(self, dictionary: Model):
+        self._root = Node()
+        self._size = 1
+        for word in dictionary.keys():
+            if isinstance(word, str):
+                self.add(word)
+
+    def add(self, word: str):
+        node = self._root
+        for ch in word:
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = Node()
+                self._size += 1
+            node = child
+        node.word = word
+
+    def search(self, word: str, d: int = 2) -> List[Tuple[str, int]]:
+        found = []
+        row = list(range(len(word) + 1))
+        if self._root.word is not None and row[-1] <= d:
+            found.append((self._root.word, row[-1]))
+        for ch, child in self._root.children.items():
+            self._walk(child, ch, word, [row], {}, d, found)
+
+        result = []
+        for candidate, dist in found:
+            if any(ch not in characters for ch in candidate):
+                dist = distance(word, candidate, d, characters)
+            if dist <= d:
+                result.append((candidate, dist))
+
+        return result
+
+    def _walk(self, node: Node, ch: str, word: str, rows: List[List[int]], last: Dict[str, int], d: int,
+              result: List[Tuple[str, int]]):
+        i, previous = len(rows), rows[-1]
+        current, matched = [previous[0] + 1], 0
+        for j in range(1, len(word) + 1):
+            k, m = last.get(word[j - 1], 0), matched
+            if word[j - 1] == ch:
+                cost, matched = 0, j
+            else:
+                cost = 1
+            value = min(current[j - 1] + 1, previous[j] + 1, previous[j - 1] + cost)
+            if k and m:
+                value = min(value, rows[k - 1][m - 1] + (i - k - 1) + 1 + (j - m - 1))
+            current.append(value)
+
+        if node.word is not None and current[-1] <= d:
+            result.append((node.word, current[-1]))
+        if min(current) <= d and node.children:
+            before = last.get(ch, 0)
+            rows.append(current)
+            last[ch] = i
+            for next_ch, child in node.children.items():
+                self._walk(child, next_ch, word, rows, last, d, result)
+            last[ch] = before
+            rows.pop()
+
+    def size(self) -> int:
+        return self._size
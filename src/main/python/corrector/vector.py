@@ -0,0 +1,191 @@
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from .basic import Engine, Model, characters
+
+_P = 0x9E3779B97F4A7C15
+_L = 0xC2B2AE3D27D4EB4F
+_BITS = 22
+
+Group = Tuple[np.ndarray, np.ndarray]
+
+
+def _powers(n: int) -> np.ndarray:
+    return np.array([pow(_P, i, 1 << 64) for i in range(n + 2)], dtype=np.uint64)
+
+
+def _tag(n: int) -> np.uint64:
+    return np.uint64(_L * n % (1 << 64))
+
+
+def _hash(codes: np.ndarray) -> np.ndarray:
+    result = np.zeros(len(codes), dtype=np.uint64)
+    for i in range(codes.shape[1]):
+        result = result * np.uint64(_P) + codes[:, i]
+
+    return result + _tag(codes.shape[1])
+
+
+def _edits(codes: np.ndarray, owners: np.ndarray, alphabet: np.ndarray) -> Dict[int, Group]:
+    k, n = codes.shape
+    a = len(alphabet)
+    groups: Dict[int, List[Group]] = {n - 1: [], n: [], n + 1: []}
+
+    if n > 0:
+        columns = np.array([[j for j in range(n) if j != i] for i in range(n)], dtype=np.intp).reshape(n, n - 1)
+        groups[n - 1].append((codes[:, columns].reshape(k * n, n - 1), np.repeat(owners, n)))
+
+        replaces = np.repeat(codes[:, None, None, :], a, axis=2).repeat(n, axis=1)
+        for i in range(n):
+            replaces[:, i, :, i] = alphabet
+        groups[n].append((replaces.reshape(k * n * a, n), np.repeat(owners, n * a)))
+
+    if n > 1:
+        swaps = np.tile(np.arange(n), (n - 1, 1))
+        for i in range(n - 1):
+            swaps[i, i], swaps[i, i + 1] = i + 1, i
+        groups[n].append((codes[:, swaps].reshape(k * (n - 1), n), np.repeat(owners, n - 1)))
+
+    inserts = np.empty((k, n + 1, a, n + 1), dtype=np.uint8)
+    for i in range(n + 1):
+        inserts[:, i, :, :i] = codes[:, None, :i]
+        inserts[:, i, :, i] = alphabet
+        inserts[:, i, :, i + 1:] = codes[:, None, i:]
+    groups[n + 1].append((inserts.reshape(k * (n + 1) * a, n + 1), np.repeat(owners, (n + 1) * a)))
+
+    return {length: (np.concatenate([c for c, _ in parts]), np.concatenate([o for _, o in parts]))
+            for length, parts in groups.items() if parts and length >= 0}
+
+
+def _hashes(codes: np.ndarray, alphabet: np.ndarray) -> List[np.ndarray]:
+    k, n = codes.shape
+    powers = _powers(n)
+    x = codes.astype(np.uint64)
+    pre = np.zeros((k, n + 1), dtype=np.uint64)
+    suf = np.zeros((k, n + 2), dtype=np.uint64)
+    for i in range(n):
+        pre[:, i + 1] = pre[:, i] * np.uint64(_P) + x[:, i]
+    for j in range(n - 1, -1, -1):
+        suf[:, j] = x[:, j] * powers[n - 1 - j] + suf[:, j + 1]
+
+    c = alphabet.astype(np.uint64)[None, None, :]
+    at = np.arange(n)
+    parts = []
+    if n > 0:
+        deletes = pre[:, :n] * powers[n - 1 - at] + suf[:, 1:n + 1] + _tag(n - 1)
+        replaces = (pre[:, :n] * powers[n - at])[:, :, None] + c * powers[n - 1 - at][None, :, None] \
+            + suf[:, 1:n + 1, None] + _tag(n)
+        parts += [deletes, replaces.reshape(k, -1)]
+    if n > 1:
+        at = np.arange(n - 1)
+        swaps = pre[:, :n - 1] * powers[n - at] + x[:, 1:] * powers[n - 1 - at] \
+            + x[:, :n - 1] * powers[n - 2 - at] + suf[:, 2:n + 1] + _tag(n)
+        parts.append(swaps)
+    at = np.arange(n + 1)
+    inserts = (pre * powers[n + 1 - at])[:, :, None] + c * powers[n - at][None, :, None] \
+        + suf[:, :n + 1, None] + _tag(n + 1)
+    parts.append(inserts.reshape(k, -1))
+
+    return parts
+
+
+class VectorEngine(Engine):
+    def __init__(self, dictionary: Model, budget: int = 1 << 26):
+        words = [word for word in dictionary.keys() if isinstance(word, str)]
+        usage = Counter(ch for word in words for ch in word)
+        symbols = list(characters) + [ch for ch, _ in usage.most_common() if ch not in characters]
+        self._codes = {ch: i + 1 for i, ch in enumerate(symbols[:254])}
+        self._alphabet = np.array([self._codes[ch] for ch in characters], dtype=np.uint8)
+        self._budget = budget
+
+        words = [word for word in words if all(ch in self._codes for ch in word)]
+        keys = self._hash(words)
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+        self._words = [words[i] for i in order]
+        self._filter = np.zeros(1 << _BITS, dtype=np.bool_)
+        self._filter[self._keys >> np.uint64(64 - _BITS)] = True
+
+    def search(self, word: str, d: int = 2) -> List[Tuple[str, int]]:
+        return next(self.search_many([word], d))
+
+    def search_many(self, words: Iterable[str], d: int = 2, window: int = 4096) -> Iterator[List[Tuple[str, int]]]:
+        words = list(words)
+        for start in range(0, len(words), window):
+            batch = words[start:start + window]
+            found: Dict[int, List[Tuple[str, int]]] = {}
+            lengths: Dict[int, List[int]] = {}
+            for i, word in enumerate(batch):
+                lengths.setdefault(len(word), []).append(i)
+            for n, members in lengths.items():
+                size = max(1, self._budget // (32 * (2 * (n + d) * len(characters)) ** d))
+                for at in range(0, len(members), size):
+                    chunk = members[at:at + size]
+                    found.update(zip(chunk, self._search([batch[i] for i in chunk], d)))
+            yield from (found[i] for i in range(len(batch)))
+
+    def size(self) -> int:
+        return len(self._keys)
+
+    def _encode(self, words: List[str]) -> np.ndarray:
+        n = len(words[0]) if words else 0
+        codes = np.fromiter((self._codes.get(ch, 255) for word in words for ch in word),
+                            dtype=np.uint8, count=n * len(words))
+        return codes.reshape(len(words), n)
+
+    def _hash(self, words: List[str]) -> np.ndarray:
+        keys = np.empty(len(words), dtype=np.uint64)
+        lengths: Dict[int, List[int]] = {}
+        for i, word in enumerate(words):
+            lengths.setdefault(len(word), []).append(i)
+        for members in lengths.values():
+            keys[members] = _hash(self._encode([words[i] for i in members]))
+
+        return keys
+
+    def _lookup(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        keys = keys.ravel()
+        candidates = np.flatnonzero(self._filter[keys >> np.uint64(64 - _BITS)])
+        at = np.searchsorted(self._keys, keys[candidates])
+        at[at == len(self._keys)] = 0
+        hits = self._keys[at] == keys[candidates]
+        return candidates[hits], at[hits]
+
+    def _probe(self, keys: np.ndarray, members: np.ndarray, dist: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows, at = self._lookup(keys)
+        return members[rows // keys.shape[1]], at, np.full(len(at), dist, dtype=np.uint8)
+
+    def _search(self, words: List[str], d: int) -> List[List[Tuple[str, int]]]:
+        codes = self._encode(words)
+        frontier = {codes.shape[1]: (codes, np.arange(len(words)))}
+        found = []
+        for level in range(d + 1):
+            for group, members in frontier.values():
+                found.append(self._probe(_hash(group)[:, None], members, level))
+            if level == d:
+                break
+            if level == d - 1:
+                for group, members in frontier.values():
+                    found += [self._probe(keys, members, d) for keys in _hashes(group, self._alphabet)]
+                break
+
+            expanded: Dict[int, List[Group]] = {}
+            for group, members in frontier.values():
+                for length, edits in _edits(group, members, self._alphabet).items():
+                    expanded.setdefault(length, []).append(edits)
+            frontier = {length: (np.concatenate([c for c, _ in parts]), np.concatenate([o for _, o in parts]))
+                        for length, parts in expanded.items()}
+
+        owners, at, dists = (np.concatenate(column) for column in zip(*found))
+        order = np.lexsort((dists, at, owners))
+        owners, at, dists = owners[order], at[order], dists[order]
+        first = np.ones(len(order), dtype=np.bool_)
+        first[1:] = (owners[1:] != owners[:-1]) | (at[1:] != at[:-1])
+
+        result: List[List[Tuple[str, int]]] = [[] for _ in words]
+        for owner, index, dist in zip(owners[first].tolist(), at[first].tolist(), dists[first].tolist()):
+            result[owner].append((self._words[index], dist))
+
+        return result
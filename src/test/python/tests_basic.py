@@ -0,0 +1,179 @@
+import os
+import tempfile
+import unittest
+from typing import Set, Tuple
+
+from assertpy import assert_that
+
+from corrector.basic import Model, candidates, correct, correct_tiered, distance, edit, suggest
+from corrector.instrument import profile
+
+_folder = os.path.join(os.path.dirname(__file__), '..', '..', 'main', 'python', 'corrector')
+
+_dictionary = Model({'the': 50, 'then': 5, 'ten': 4, 'tea': 8, 'spelling': 3})
+_errors = Model({0: 90, 1: 9, 2: 1})
+
+
+def _found(word: str, dictionary: Model, d: int) -> Set[Tuple[str, int]]:
+    return {(candidate, dist) for dist, hits in candidates(word, dictionary, d) for candidate in hits}
+
+
+class SuggestTest(unittest.TestCase):
+    def test_top_k(self):
+        found = suggest('teh', _dictionary, _errors, 3)
+        assert_that(found).is_length(3)
+        assert_that(found[0][0]).is_equal_to('the')
+        assert_that([score for _, score, _ in found]).is_sorted(reverse=True)
+
+    def test_empty_k(self):
+        assert_that(suggest('teh', _dictionary, _errors, 0)).is_empty()
+        assert_that(suggest('teh', _dictionary, _errors, -1)).is_empty()
+
+    def test_correct(self):
+        assert_that(correct('speling', _dictionary, _errors)).is_equal_to('spelling')
+        assert_that(correct('qqqqqq', _dictionary, _errors)).is_equal_to('qqqqqq')
+
+
+class ModelPruneTest(unittest.TestCase):
+    def test_min_count(self):
+        assert_that(_dictionary.prune(5).keys()).is_equal_to({'the', 'then', 'tea'})
+        assert_that(_dictionary.prune(51).size()).is_zero()
+
+    def test_top(self):
+        assert_that(_dictionary.prune(top=2).keys()).is_equal_to({'the', 'tea'})
+        assert_that(_dictionary.prune(4, top=10).keys()).is_equal_to({'the', 'then', 'tea', 'ten'})
+
+    def test_pattern(self):
+        assert_that(_dictionary.prune(pattern='te.').keys()).is_equal_to({'ten', 'tea'})
+        assert_that(_dictionary.prune(5, pattern='t.*').keys()).is_equal_to({'the', 'then', 'tea'})
+        assert_that(_errors.prune(pattern='[01]').keys()).is_equal_to({0, 1})
+
+    def test_keeps_the_original(self):
+        pruned = _dictionary.prune(top=1)
+        assert_that(pruned['the']).is_equal_to(50)
+        assert_that(_dictionary.size()).is_equal_to(5)
+
+
+class TieredTest(unittest.TestCase):
+    def setUp(self):
+        self.full = Model({'the': 50, 'spending': 40, 'spelling': 3, 'zebra': 1})
+        self.tiers = [self.full.prune(10), self.full]
+
+    def test_hot_tier_answers_close_words(self):
+        assert_that(correct_tiered('teh', self.tiers, _errors)).is_equal_to('the')
+
+    def test_falls_back_to_a_closer_word(self):
+        assert_that(distance('speling', 'spending', 2)).is_equal_to(2)
+        assert_that(self.tiers[0]).does_not_contain('spelling')
+        assert_that(correct_tiered('speling', self.tiers, _errors)).is_equal_to('spelling')
+        assert_that(correct_tiered('spendin', self.tiers, _errors)).is_equal_to('spending')
+
+    def test_falls_back_when_the_hot_tier_has_nothing(self):
+        assert_that(correct_tiered('zebr', self.tiers, _errors)).is_equal_to('zebra')
+        assert_that(correct_tiered('qqqqq', self.tiers, _errors)).is_equal_to('qqqqq')
+
+    def test_known_words_and_table(self):
+        assert_that(correct_tiered('zebra', self.tiers, _errors)).is_equal_to('zebra')
+        assert_that(correct_tiered('zbr', self.tiers, _errors, table={'zbr': 'zebra'})).is_equal_to('zebra')
+
+
+class PruningTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dictionary = Model.load(os.path.join(_folder, 'words.json'))
+
+    def unpruned(self, word: str, dictionary: Model, d: int):
+        seen, level, result = {word}, {word}, set()
+        for i in range(1, d + 1):
+            level = {item for e in level for item in edit(e)} - seen
+            seen |= level
+            result |= {(candidate, i) for candidate in dictionary.filter(level)}
+
+        return result | {(candidate, 0) for candidate in dictionary.filter({word})}
+
+    def test_pruned_candidates_match_unpruned_edits(self):
+        for word in ('accomodation', 'independant', 'embarassment', 'speling', 'qwertyuiop'):
+            for d in (1, 2):
+                with self.subTest(word=word, d=d):
+                    expected = self.unpruned(word, self.dictionary, d)
+                    assert_that(_found(word, self.dictionary, d)).is_equal_to(expected)
+
+    def test_pruned_candidates_on_compact_model(self):
+        handle, filename = tempfile.mkstemp(suffix='.bin')
+        os.close(handle)
+        try:
+            words = Model({key: self.dictionary.freq(key) for key in self.dictionary.keys() if isinstance(key, str)})
+            words.save_compact(filename)
+            compact = Model.load_compact(filename)
+            for word in ('independant', 'speling'):
+                assert_that(_found(word, compact, 2)).is_equal_to(self.unpruned(word, words, 2))
+        finally:
+            os.remove(filename)
+
+
+class EarlyStopTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dictionary = Model.load(os.path.join(_folder, 'words.json'))
+        cls.errors = Model.load(os.path.join(_folder, 'errors.json'))
+
+    def test_known_word_is_a_single_lookup(self):
+        with profile() as stats:
+            assert_that(correct('the', self.dictionary, self.errors)).is_equal_to('the')
+        assert_that(stats.snapshot()['counts']).does_not_contain_key('candidates.1')
+
+    def test_known_word_without_neighbours_skips_the_last_level(self):
+        rare = [key for key in self.dictionary.keys() if isinstance(key, str) and self.dictionary.freq(key) == 1][:5]
+        with profile() as stats:
+            assert_that([correct(word, self.dictionary, self.errors) for word in rare]).is_equal_to(rare)
+        assert_that(stats.snapshot()['counts']).does_not_contain_key('candidates.2')
+
+    def test_top_one_stops_before_the_next_level(self):
+        with profile() as stats:
+            found = suggest('teh', self.dictionary, self.errors, 1)
+        assert_that(found[0][0]).is_equal_to('the')
+        assert_that(stats.snapshot()['counts']).contains_key('candidates.1').does_not_contain_key('candidates.2')
+
+        with profile() as stats:
+            suggest('teh', self.dictionary, self.errors, 5)
+        assert_that(stats.snapshot()['counts']).contains_key('candidates.2')
+
+
+class ModelIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.model = Model({'the': 5, 'then': 2, 'ten': 1, 'cat': 3, 404: 1})
+
+    def test_near(self):
+        assert_that(set(self.model.near('teh', 1))).contains('the', 'ten', 'then').does_not_contain('cat', 404)
+        assert_that(set(self.model.near('teh', 0))).is_equal_to({'the'})
+        assert_that(set(self.model.near('xyzzy', 1))).is_empty()
+
+    def test_update_and_subtract_keep_the_partitions(self):
+        self.model.near('the', 1)
+        self.model.update({'tha': 1})
+        assert_that(set(self.model.near('the', 1))).contains('tha')
+        self.model.subtract({'tha': 1, 'ten': 5})
+        assert_that(self.model).does_not_contain('tha', 'ten')
+        assert_that(set(self.model.near('the', 1))).does_not_contain('tha', 'ten')
+        self.model.subtract({'zzz': -2})
+        assert_that(self.model).contains('zzz')
+        assert_that(set(self.model.near('zz', 1))).contains('zzz')
+        assert_that(self.model.total()).is_equal_to(5 + 2 + 3 + 1 + 2)
+
+    def test_update_and_subtract_refresh_the_indexes(self):
+        version = self.model.version()
+        assert_that(self.model.prefixes()).does_not_contain_key('do')
+        assert_that(self.model.logprob('dog')).is_equal_to(float('-inf'))
+        self.model.update(['dog', 'dog'])
+        assert_that(self.model.prefixes()['do']).is_equal_to('g')
+        assert_that(self.model.bigrams()).contains('og')
+        assert_that(self.model.logprob('dog')).is_greater_than(float('-inf'))
+        self.model.subtract({'dog': 2})
+        assert_that(self.model.prefixes()).does_not_contain_key('do')
+        assert_that(self.model.bigrams()).does_not_contain('og')
+        assert_that(self.model.logprob('dog')).is_equal_to(float('-inf'))
+        assert_that(self.model.version()).is_equal_to(version + 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+
+from assertpy import assert_that
+
+from corrector.basic import Model, parse
+from corrector.builder import _save, build, chunks, count, shards, tokenize
+
+_text = 'The café sat on the mat.\nA naïve cat ate the hat!\n' * 40 + 'last line without newline'
+
+
+def _counts(model: Model) -> dict:
+    return {key: model.freq(key) for key in model.keys()}
+
+
+class BuilderTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, 'corpus.txt')
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            file.write(_text)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_tokens_split_across_chunks(self):
+        for size in (1, 2, 3, 7, 64):
+            with self.subTest(size=size):
+                assert_that(list(tokenize(chunks(self.filename, size=size)))).is_equal_to(parse(_text))
+
+    def test_long_token(self):
+        assert_that(list(tokenize(['a' * 20000 + ' b']))).is_equal_to(['a' * 20000, 'b'])
+        assert_that(list(tokenize(['x' * 1000] * 50 + [' end']))).is_equal_to(['x' * 50000, 'end'])
+
+    def test_shards_end_on_line_boundaries(self):
+        with open(self.filename, 'rb') as file:
+            data = file.read()
+        found = shards([self.filename], 100)
+        assert_that(found[0][1]).is_equal_to(0)
+        assert_that(found[-1][2]).is_equal_to(len(data))
+        for (_, _, end), (_, start, _) in zip(found, found[1:]):
+            assert_that(start).is_equal_to(end)
+            assert_that(data[end - 1:end]).is_equal_to(b'\n')
+        total = Counter()
+        for shard in found:
+            total.update(count(shard))
+        assert_that(dict(total)).is_equal_to(dict(Counter(parse(_text))))
+
+    def test_checkpoint_resume(self):
+        checkpoint = os.path.join(self.folder, 'checkpoint.json')
+        found = shards([self.filename], 100)
+        _save(Model(count(found[0])), {found[0]}, checkpoint)
+
+        model = build([self.filename], workers=1, size=100, checkpoint=checkpoint, every=2)
+        assert_that(_counts(model)).is_equal_to(dict(Counter(parse(_text))))
+
+        with open(checkpoint + '.done', 'r') as file:
+            assert_that(file.read()).contains(self.filename)
+        resumed = build([self.filename], workers=1, size=100, checkpoint=checkpoint)
+        assert_that(_counts(resumed)).is_equal_to(_counts(model))
+
+
+if __name__ == '__main__':
+    unittest.main()
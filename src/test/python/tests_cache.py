@@ -0,0 +1,75 @@
+import unittest
+
+from assertpy import assert_that
+
+from corrector.basic import Model
+from corrector.cache import Cache, cached
+
+
+class CacheTest(unittest.TestCase):
+    def test_lru_eviction_order(self):
+        cache = Cache(3, 'lru')
+        for key in 'abc':
+            cache.put(key, key.upper())
+        cache.get('a')
+        cache.put('d', 'D')
+        cache.put('e', 'E')
+        assert_that(cache.get('b')).is_none()
+        assert_that(cache.get('c')).is_none()
+        assert_that([cache.get(key) for key in 'ade']).is_equal_to(['A', 'D', 'E'])
+        assert_that(cache.stats()).contains_entry({'evictions': 2}, {'hits': 4}, {'misses': 2})
+
+    def test_lfu_eviction_order(self):
+        cache = Cache(3, 'lfu')
+        for key in 'abc':
+            cache.put(key, key.upper())
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        cache.put('d', 'D')
+        assert_that(cache.get('c')).is_none()
+        cache.put('e', 'E')
+        assert_that(cache.get('d')).is_none()
+        assert_that([cache.get(key) for key in 'abe']).is_equal_to(['A', 'B', 'E'])
+        assert_that(cache.stats()).contains_entry({'evictions': 2}, {'hits': 6}, {'misses': 2})
+        assert_that(cache.hit_rate()).is_equal_to(0.75)
+
+    def test_invalidation(self):
+        cache = Cache(3)
+        cache.validate(1)
+        cache.put('a', 'A')
+        cache.validate(1)
+        assert_that(cache.get('a')).is_equal_to('A')
+        cache.validate(2)
+        assert_that(cache.get('a')).is_none()
+        assert_that(cache.stats()).contains_entry({'invalidations': 1}, {'size': 0})
+
+    def test_cached_follows_model_version(self):
+        calls = []
+
+        def fix(word: str, dictionary: Model) -> str:
+            calls.append(word)
+            return word if word in dictionary else 'world'
+
+        dictionary = Model({'world': 10})
+        cache = Cache(8)
+        wrapper = cached(fix, cache)
+        assert_that(wrapper('wrld', dictionary)).is_equal_to('world')
+        assert_that(wrapper('wrld', dictionary)).is_equal_to('world')
+        dictionary.update({'wrld': 10 ** 7})
+        assert_that(wrapper('wrld', dictionary)).is_equal_to('wrld')
+        assert_that(calls).is_length(2)
+        assert_that(cache.stats()).contains_entry({'invalidations': 1})
+
+    def test_cached_follows_tiers(self):
+        hot, full = Model({'a': 1}), Model({'a': 1})
+        cache = Cache(8)
+        wrapper = cached(lambda word, tiers: word, cache)
+        wrapper('x', (hot, full))
+        full.update({'b': 1})
+        wrapper('x', (hot, full))
+        assert_that(cache.stats()).contains_entry({'invalidations': 1}, {'hits': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+
+from assertpy import assert_that
+
+from corrector.channel import ConfusionChannel
+
+_pairs = [('teh', 'the'), ('speling', 'spelling'), ('wrld', 'world'), ('recieve', 'receive'),
+          ('acommodate', 'accommodate')]
+
+
+class ConfusionChannelTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix='.bin')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_round_trip(self):
+        channel = ConfusionChannel.build(_pairs)
+        channel.save(self.filename)
+        loaded = ConfusionChannel.load(self.filename)
+        assert_that(loaded.fingerprint()).is_equal_to(channel.fingerprint())
+        assert_that(loaded.priors('teh', 2)).is_equal_to(channel.priors('teh', 2))
+        for error, correct in _pairs + [('wrod', 'word'), ('xyz', 'xyz')]:
+            assert_that(loaded.logprob(error, correct, 1)).is_equal_to(channel.logprob(error, correct, 1))
+
+    def test_bad_magic(self):
+        with open(self.filename, 'wb') as file:
+            file.write(b'\0' * 64)
+        assert_that(ConfusionChannel.load).raises(ValueError).when_called_with(self.filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
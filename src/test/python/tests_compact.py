@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from assertpy import assert_that
+
+from corrector.basic import Model
+from corrector.compact import Counts, pack, write
+
+_words = {'a': 5, 'ab': 3, 'abc': 1, 'abd': 2, 'b': 7, 'ba': 1, 'café': 4, 'cafe': 2}
+
+
+class CountsTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix='.bin')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_round_trip(self):
+        write(self.filename, _words.items())
+        counts = Counts(self.filename)
+        assert_that(dict(counts.items())).is_equal_to(_words)
+        assert_that(list(counts)).is_equal_to(sorted(_words, key=lambda word: word.encode('utf-8')))
+        assert_that(len(counts)).is_equal_to(len(_words))
+        assert_that(counts['café']).is_equal_to(4)
+        assert_that(counts['zz']).is_equal_to(0)
+        assert_that(counts.get('zz')).is_none()
+        assert_that(counts.key(counts.index('abd'))).is_equal_to('abd')
+        assert_that(counts.index(42)).is_equal_to(-1)
+        assert_that(counts.following('ab')).is_equal_to('cd')
+        assert_that(counts.following('abc')).is_equal_to('')
+        assert_that(counts.following('x')).is_none()
+
+    def test_offset(self):
+        with open(self.filename, 'wb') as file:
+            file.write(b'\0' * 16 + pack(_words.items()))
+        assert_that(dict(Counts(self.filename, 16).items())).is_equal_to(_words)
+
+    def test_bad_magic(self):
+        with open(self.filename, 'wb') as file:
+            file.write(b'\0' * 32)
+        assert_that(Counts).raises(ValueError).when_called_with(self.filename)
+
+
+class CompactModelTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix='.bin')
+        os.close(handle)
+        self.model = Model(_words)
+        self.model.save_compact(self.filename)
+        self.compact = Model.load_compact(self.filename)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_logprob(self):
+        for word in _words:
+            assert_that(self.compact.logprob(word)).is_close_to(self.model.logprob(word), 1e-12)
+        assert_that(self.compact.logprob('zz')).is_equal_to(float('-inf'))
+        assert_that(self.compact.logmax()).is_close_to(self.model.logmax(), 1e-12)
+
+    def test_prefixes(self):
+        expected, prefixes = self.model.prefixes(), self.compact.prefixes()
+        assert_that(dict(prefixes)).is_equal_to(dict(expected))
+        assert_that(prefixes.get('caz')).is_none()
+        assert_that(self.compact.bigrams()).is_equal_to(self.model.bigrams())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import random
+import unittest
+from typing import Set, Tuple
+
+from assertpy import assert_that
+
+from jellyfish import damerau_levenshtein_distance
+
+from corrector.basic import Model, candidates, characters, correct, distance
+from corrector.engines import amend, create, names
+from corrector.scan import Scan
+from corrector.symspell import SymSpell
+from corrector.trie import Trie
+from corrector.vector import VectorEngine
+
+_folder = os.path.join(os.path.dirname(__file__), '..', '..', 'main', 'python', 'corrector')
+_words = ['chikens', 'abrod', 'ete', 'wated', 'speling', 'korrectud', 'teh', 'a', 'quizz', "dont", 'x-ray']
+
+
+def _found(word: str, dictionary: Model, d: int) -> Set[Tuple[str, int]]:
+    return {(candidate, dist) for dist, hits in candidates(word, dictionary, d) for candidate in hits}
+
+
+class EnginesTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dictionary = Model.load(os.path.join(_folder, 'words.json'))
+        cls.kinds = (Scan, SymSpell, Trie, VectorEngine)
+        cls.engines = [engine(cls.dictionary) for engine in cls.kinds]
+
+    def test_engines_agree_with_candidates(self):
+        for d in (1, 2):
+            for word in _words:
+                expected = _found(word, self.dictionary, d)
+                for engine in self.engines:
+                    with self.subTest(engine=type(engine).__name__, word=word, d=d):
+                        assert_that(set(engine.search(word, d))).is_equal_to(expected)
+
+    def test_distance(self):
+        for source, target in [('ca', 'abc'), ('chikens', 'chinks'), ('abrod', 'aboard'), ('ete', 'thee'),
+                               ('wated', 'wead'), ('teh', 'the'), ('', 'abc'), ('abc', '')]:
+            expected = damerau_levenshtein_distance(source, target)
+            assert_that(distance(source, target)).is_equal_to(expected)
+            assert_that(distance(source, target, 1)).is_equal_to(min(expected, 2))
+
+    def test_distance_alphabet(self):
+        assert_that(distance('', '\u00e9', 2, characters)).is_equal_to(3)
+        assert_that(distance('ab1', 'ab2', 2, characters)).is_equal_to(3)
+        assert_that(distance('1ab', 'ab', 2, characters)).is_equal_to(1)
+        assert_that(distance('bb1', '1bb', 2, characters)).is_equal_to(2)
+        assert_that(distance('XaaX', 'aaXX', 2, characters)).is_equal_to(2)
+        assert_that(distance('XaaX', 'aaXX', 1, characters)).is_equal_to(2)
+        assert_that(distance('XYZ', 'ZXY', None, characters)).is_equal_to(2)
+
+    def test_engines_agree_outside_the_alphabet(self):
+        rng = random.Random(3)
+        words = {''.join(rng.choice('ab1\u00e9') for _ in range(rng.randint(1, 5))) for _ in range(300)}
+        dictionary = Model(words | {'caf\u00e9', 'na\u00efve', 'bb1', 'aa\u00e9\u00e9'})
+        engines = [engine(dictionary) for engine in self.kinds]
+        queries = ['1bb', '\u00e9aa\u00e9', 'cafe', 'caf\u00e9s', 'naive'] + \
+            [''.join(rng.choice('ab1\u00e9') for _ in range(rng.randint(0, 5))) for _ in range(100)]
+        for d in (1, 2):
+            for word in queries:
+                expected = _found(word, dictionary, d)
+                for engine in engines:
+                    with self.subTest(engine=type(engine).__name__, word=word, d=d):
+                        assert_that(set(engine.search(word, d))).is_equal_to(expected)
+
+    def test_transposition_with_insertion(self):
+        for engine in self.engines:
+            assert_that(engine.search('chikens', 2)).contains(('chickens', 1))
+            assert_that(dict(engine.search('abrod', 2))).contains_entry({'aboard': 2})
+
+
+class AmendTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dictionary = Model({'the': 50, 'spelling': 3, 'world': 9, 'hello': 4, 'is': 20, 'i': 30, 'id': 2,
+                                'user': 5})
+        errors = Model({0: 90, 1: 9, 2: 1})
+        cls.fix = staticmethod(lambda word: correct(word, cls.dictionary, errors))
+
+    def amend(self, *lines: str):
+        return list(amend(lines, self.dictionary, self.fix))
+
+    def test_layout_is_preserved(self):
+        assert_that(self.amend('  teh\tspeling,  wrld!\n', 'helo--wrld...\r\n', '\n', '')).is_equal_to(
+            ['  the\tspelling,  world!\n', 'hello--world...\r\n', '\n', ''])
+
+    def test_capitalisation_is_preserved(self):
+        assert_that(self.amend('Teh SPELING is Wrld I')).is_equal_to(['The SPELLING is World I'])
+
+    def test_numbers_and_identifiers_are_left_alone(self):
+        line = 'HTTP 404 for id=48213 user_id a3f9c wrld2 teh\n'
+        assert_that(self.amend(line)).is_equal_to(['HTTP 404 for id=48213 user_id a3f9c wrld2 the\n'])
+
+    def test_known_words_are_not_looked_up(self):
+        seen = []
+        list(amend(['The WORLD is, teh'], self.dictionary, lambda word: seen.append(word) or word))
+        assert_that(seen).is_equal_to(['teh'])
+
+
+class CreateTest(unittest.TestCase):
+    def test_every_name_creates(self):
+        dictionary = Model({'the': 1, 'then': 1})
+        for name in names:
+            engine = create(name, dictionary)
+            if engine is not None:
+                assert_that(engine.search('teh', 1)).contains(('the', 1))
+        assert_that(create('edits', dictionary)).is_none()
+        assert_that(create).raises(ValueError).when_called_with('bogus', dictionary)
+
+
+if __name__ == '__main__':
+    unittest.main()
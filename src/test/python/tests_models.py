@@ -0,0 +1,53 @@
+import os
+import unittest
+from threading import Thread
+
+from assertpy import assert_that
+
+from corrector import models, norvig
+from corrector.basic import Model
+
+_folder = os.path.join(os.path.dirname(__file__), '..', '..', 'main', 'python', 'corrector')
+
+
+class ModelsTest(unittest.TestCase):
+    def tearDown(self):
+        for name in ('tests.lazy', 'norvig'):
+            models.unload(name)
+        models.register('norvig', norvig._load, replace=True)
+
+    def test_lazy_and_shared(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return Model(['a', 'b', 'a'])
+
+        models.register('tests.lazy', factory, replace=True)
+        assert_that(models.loaded('tests.lazy')).is_false()
+        threads = [Thread(target=models.get, args=('tests.lazy',)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert_that(calls).is_length(1)
+        assert_that(models.get('tests.lazy')).is_same_as(models.get('tests.lazy'))
+        assert_that(models.register).raises(ValueError).when_called_with('tests.lazy', factory)
+
+    def test_unknown(self):
+        assert_that(models.get).raises(KeyError).when_called_with('tests.unknown')
+
+    @unittest.skipIf(os.path.exists(os.path.join(_folder, 'content.txt')), 'content.txt is present')
+    def test_missing_content_raises(self):
+        assert_that(models.get).raises(FileNotFoundError).when_called_with('content')
+        assert_that(models.get).raises(FileNotFoundError).when_called_with('norvig')
+
+    def test_norvig_words_is_counter_compatible(self):
+        models.register('norvig', lambda: Model(['the', 'the', 'cat']), replace=True)
+        assert_that(norvig.WORDS['the']).is_equal_to(2)
+        assert_that(norvig.WORDS['dog']).is_equal_to(0)
+        assert_that(norvig.correction('teh')).is_equal_to('the')
+
+
+if __name__ == '__main__':
+    unittest.main()
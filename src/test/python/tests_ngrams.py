@@ -0,0 +1,86 @@
+import math
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+
+from assertpy import assert_that
+
+from corrector import ngrams
+from corrector.basic import Model
+from corrector.decoder import decode
+from corrector.ngrams import NGrams
+
+
+class NGramsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.folder = tempfile.mkdtemp()
+        cls.filename = os.path.join(cls.folder, 'grams.bin')
+        cls.counters = [
+            Counter({'the': 10, 'cat': 5, 'car': 50, 'drove': 5, 'ünïcode': 1}),
+            Counter({('the', 'cat'): 5, ('the', 'car'): 2, ('drove', 'car'): 5, ('drove', 'the'): 2,
+                     ('cat', 'ünïcode'): 1, ('the', 'missing'): 3}),
+            Counter({('drove', 'the', 'car'): 2}),
+        ]
+        ngrams.write(cls.filename, cls.counters)
+        cls.lm = NGrams(cls.filename)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.folder)
+
+    def test_round_trip(self):
+        assert_that(self.lm.order()).is_equal_to(3)
+        for counter in self.counters[1:]:
+            for gram, value in counter.items():
+                if 'missing' not in gram:
+                    assert_that(self.lm.count(gram)).is_equal_to(value)
+        assert_that(self.lm.count(('car',))).is_equal_to(50)
+        assert_that(self.lm).contains('ünïcode').does_not_contain('missing')
+
+    def test_unknown_grams_count_zero(self):
+        assert_that(self.lm.count(('cat', 'the'))).is_zero()
+        assert_that(self.lm.count(('the', 'missing'))).is_zero()
+        assert_that(self.lm.count(('the', 'cat', 'drove', 'car'))).is_zero()
+
+    def test_packed_keys(self):
+        top = (1 << ngrams._bits) - 1
+        assert_that(ngrams._key([1, 2, 3])).is_equal_to((1 << 42) | (2 << 21) | 3)
+        assert_that(ngrams._key([top] * ngrams.max_order)).is_equal_to((1 << 63) - 1)
+        assert_that(ngrams.max_order).is_equal_to(3)
+
+    def test_rejects_orders_beyond_the_key(self):
+        filename = os.path.join(self.folder, 'deep.bin')
+        assert_that(ngrams.write).raises(ValueError).when_called_with(filename, self.counters + [Counter()])
+        assert_that(os.path.exists(filename)).is_false()
+
+    def test_rejects_other_files(self):
+        filename = os.path.join(self.folder, 'other.bin')
+        with open(filename, 'wb') as file:
+            file.write(b'\0' * 64)
+        assert_that(NGrams).raises(ValueError).when_called_with(filename)
+
+    def test_logprob_uses_the_longest_known_context(self):
+        assert_that(self.lm.logprob('car', ('drove', 'the'))).is_close_to(math.log(2 / 2), 1e-9)
+        assert_that(self.lm.logprob('cat', ('the',))).is_close_to(math.log(5 / 10), 1e-9)
+        assert_that(self.lm.logprob('cat', ('drove', 'the'))).is_close_to(math.log(0.4) + math.log(5 / 10), 1e-9)
+
+    def test_logprob_backs_off_to_unigrams(self):
+        total = sum(self.counters[0].values())
+        assert_that(self.lm.logprob('car')).is_close_to(math.log(50 / total), 1e-9)
+        assert_that(self.lm.logprob('car', ('the', 'cat'))).is_close_to(2 * math.log(0.4) + math.log(50 / total), 1e-9)
+        assert_that(self.lm.logprob('zebra')).is_close_to(math.log(0.5 / total), 1e-9)
+        assert_that(self.lm.logprob('zebra', ('the',))).is_less_than(self.lm.logprob('cat', ('drove',)))
+
+    def test_decode_picks_the_path_the_context_supports(self):
+        dictionary = Model({'the': 10, 'cat': 5, 'car': 50, 'drove': 5})
+        errors = Model({0: 90, 1: 9, 2: 1})
+        assert_that(decode(['the', 'cax'], self.lm, dictionary, errors)).is_equal_to(['the', 'cat'])
+        assert_that(decode(['drove', 'cax'], self.lm, dictionary, errors)).is_equal_to(['drove', 'car'])
+        assert_that(decode(['drove', 'teh', 'cax'], self.lm, dictionary, errors)).is_equal_to(['drove', 'the', 'car'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import unittest
+
+from assertpy import assert_that
+
+from corrector import basic, parallel
+from corrector.basic import Model
+from corrector.symspell import SymSpell
+
+_folder = os.path.join(os.path.dirname(__file__), '..', '..', 'main', 'python', 'corrector')
+_texts = ['teh chikens wated abrod', 'speling is korrectud', 'the quizz', 'teh teh teh', '', 'a ete x-ray dont']
+
+
+class ParallelTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dictionary = Model.load(os.path.join(_folder, 'words.json'))
+        cls.errors = Model.load(os.path.join(_folder, 'errors.json'))
+        cls.tokens = ' '.join(_texts).split()
+
+    def test_correct_batch_matches_serial(self):
+        expected = [basic.correct(token, self.dictionary, self.errors) for token in self.tokens]
+        for workers in (1, 2):
+            found = parallel.correct_batch(self.tokens, self.dictionary, self.errors, workers=workers)
+            assert_that(found).is_equal_to(expected)
+        assert_that(basic.correct_batch(self.tokens, self.dictionary, self.errors)).is_equal_to(expected)
+
+    def test_correct_batch_with_engine(self):
+        engine = SymSpell(self.dictionary, 1)
+        expected = [basic.correct(token, self.dictionary, self.errors, 1, engine) for token in self.tokens]
+        found = parallel.correct_batch(self.tokens, self.dictionary, self.errors, 1, engine, workers=2)
+        assert_that(found).is_equal_to(expected)
+
+    def test_review_many_matches_serial(self):
+        expected = [basic.review(text, self.dictionary, self.errors) for text in _texts]
+        assert_that(parallel.review_many(_texts, self.dictionary, self.errors, workers=2)).is_equal_to(expected)
+        assert_that(basic.review_many(_texts, self.dictionary, self.errors)).is_equal_to(expected)
+
+    def test_known_words_skip_the_pool(self):
+        assert_that(parallel.correct_batch(['the', 'a'], self.dictionary, self.errors, workers=2)).is_equal_to(
+            ['the', 'a'])
+        assert_that(parallel.correct_batch([], self.dictionary, self.errors)).is_empty()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from typing import List, Tuple
+
+from assertpy import assert_that
+
+from corrector.basic import Engine, Model
+from corrector.server import Server
+
+_dictionary = Model({'the': 50, 'spelling': 3, 'world': 9, 'hello': 4, 'cat': 6})
+_errors = Model({0: 90, 1: 9, 2: 1})
+
+
+class _Broken(Engine):
+    def search(self, word: str, d: int = 2) -> List[Tuple[str, int]]:
+        raise RuntimeError('broken engine')
+
+
+class ServerTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'corrector.sock')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def serve(self, scenario, **options):
+        async def run():
+            server = Server(_dictionary, _errors, workers=0, **options)
+            await server.start(path=self.path)
+            try:
+                return await scenario(server)
+            finally:
+                await server.close()
+
+        return asyncio.run(run())
+
+    def test_pipelined_replies_keep_their_order(self):
+        lines = ['teh cat\n', 'Helo WRLD!\n', 'the\n', 'speling, teh\r\n', ':metrics\n', 'wrld\n']
+
+        async def scenario(server):
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            writer.write(''.join(lines).encode('utf-8'))
+            await writer.drain()
+            replies = [(await reader.readline()).decode('utf-8') for _ in lines]
+            writer.close()
+            return replies
+
+        replies = self.serve(scenario)
+        assert_that(replies[:4]).is_equal_to(['the cat\n', 'Hello WORLD!\n', 'the\n', 'spelling, the\r\n'])
+        assert_that(json.loads(replies[4])).contains_key('p99_ms', 'batches')
+        assert_that(replies[5]).is_equal_to('world\n')
+
+    def test_batching_and_dedup(self):
+        async def scenario(server):
+            texts = ['teh wrld', 'teh', 'wrld teh', 'helo'] * 5
+            return await asyncio.gather(*[server.correct(text) for text in texts]), server.metrics()
+
+        results, metrics = self.serve(scenario, window=0.05)
+        assert_that(results[:4]).is_equal_to(['the world', 'the', 'world the', 'hello'])
+        assert_that(metrics).contains_entry({'requests': 20}, {'tokens': 30}, {'errors': 0})
+        assert_that(metrics['batches']).is_less_than(20)
+        assert_that(metrics['unique']).is_less_than(metrics['tokens'])
+        assert_that(metrics['unique']).is_equal_to(3 * metrics['batches'])
+
+    def test_table_only_requests_skip_the_batcher(self):
+        async def scenario(server):
+            return await server.correct('Teh 404 wrld'), server.metrics()
+
+        result, metrics = self.serve(scenario, table={'teh': 'the', 'wrld': 'world'})
+        assert_that(result).is_equal_to('The 404 world')
+        assert_that(metrics).contains_entry({'requests': 1}, {'batches': 0})
+
+    def test_errors_reach_every_request_in_the_batch(self):
+        async def scenario(server):
+            results = await asyncio.gather(server.correct('teh'), server.correct('wrld'), return_exceptions=True)
+            return results, server.metrics()
+
+        results, metrics = self.serve(scenario, engine=_Broken(), window=0.05)
+        for result in results:
+            assert_that(result).is_instance_of(RuntimeError)
+        assert_that(metrics['errors']).is_equal_to(2)
+
+    def test_failed_lines_are_echoed(self):
+        async def scenario(server):
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            writer.write(b'teh\nthe\n')
+            await writer.drain()
+            replies = [await reader.readline(), await reader.readline()]
+            writer.close()
+            return replies
+
+        with self.assertLogs('corrector.server') as logs:
+            replies = self.serve(scenario, engine=_Broken())
+        assert_that(replies).is_equal_to([b'teh\n', b'the\n'])
+        assert_that(logs.output).is_length(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from assertpy import assert_that
+
+from corrector.basic import Model
+from corrector.table import Table, build, version, write
+
+
+class TableTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix='.bin')
+        os.close(handle)
+        self.dictionary = Model({'the': 50, 'spelling': 3, 'world': 9, 'word': 4})
+        self.errors = Model({0: 90, 1: 9, 2: 1})
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_round_trip(self):
+        corrections = build(['teh', 'speling', 'wrld', 'the', 'teh'], self.dictionary, self.errors)
+        assert_that(corrections).is_equal_to({'teh': 'the', 'speling': 'spelling', 'wrld': 'world'})
+
+        stamp = version(self.dictionary, self.errors)
+        write(self.filename, corrections, stamp)
+        table = Table(self.filename)
+        assert_that(len(table)).is_equal_to(3)
+        assert_that(table.version()).is_equal_to(stamp)
+        for word, correction in corrections.items():
+            assert_that(table).contains(word)
+            assert_that(table[word]).is_equal_to(correction)
+        assert_that(table.get('zzz')).is_none()
+        assert_that(table.__getitem__).raises(KeyError).when_called_with('zzz')
+
+    def test_version_check(self):
+        write(self.filename, {'teh': 'the'}, version(self.dictionary, self.errors))
+        table = Table(self.filename)
+        assert_that(table.matches(self.dictionary, self.errors)).is_true()
+        assert_that(table.matches(self.dictionary, self.errors, 1)).is_false()
+        assert_that(table.matches(self.dictionary, Model({0: 1}))).is_false()
+        self.dictionary.update({'teh': 1})
+        assert_that(table.matches(self.dictionary, self.errors)).is_false()
+
+    def test_bad_magic(self):
+        with open(self.filename, 'wb') as file:
+            file.write(b'\0' * 64)
+        assert_that(Table).raises(ValueError).when_called_with(self.filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import unittest
+from collections import Counter
+from typing import Set, Tuple
+
+import numpy as np
+from assertpy import assert_that
+
+from corrector.basic import Model, candidates
+from corrector.vector import VectorEngine, _edits, _hash, _hashes
+
+_folder = os.path.join(os.path.dirname(__file__), '..', '..', 'main', 'python', 'corrector')
+_words = ['teh', 'a', 'xq', 'wrld', 'speling', 'abrod']
+
+
+def _found(word: str, dictionary: Model, d: int) -> Set[Tuple[str, int]]:
+    return {(candidate, dist) for dist, hits in candidates(word, dictionary, d) for candidate in hits}
+
+
+class VectorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        full = Model.load(os.path.join(_folder, 'words.json'))
+        cls.dictionary = Model({word: full.freq(word) for word in full.best(3000) if isinstance(word, str)})
+        cls.engine = VectorEngine(cls.dictionary)
+
+    def test_hashes_match_materialised_edits(self):
+        alphabet = self.engine._alphabet
+        for words in (['a', 'i'], ['teh', 'cat', 'zzz'], ['speling', 'abcdefg']):
+            codes = self.engine._encode(words)
+            owners = np.arange(len(words))
+            expected = [Counter() for _ in words]
+            for group, members in _edits(codes, owners, alphabet).values():
+                for owner, key in zip(members.tolist(), _hash(group).tolist()):
+                    expected[owner][key] += 1
+            found = np.concatenate([part.reshape(len(words), -1) for part in _hashes(codes, alphabet)], axis=1)
+            for i, row in enumerate(found.tolist()):
+                assert_that(Counter(row)).is_equal_to(expected[i])
+
+    def test_search_matches_candidates(self):
+        for d, words in enumerate([_words, _words, _words, _words[:4]]):
+            for word in words:
+                with self.subTest(word=word, d=d):
+                    expected = _found(word, self.dictionary, d)
+                    assert_that(set(self.engine.search(word, d))).is_equal_to(expected)
+
+    def test_search_many_matches_search(self):
+        words = ['teh', 'speling', 'wrld', 'teh', 'quikc']
+        assert_that(list(self.engine.search_many(words, 2))).is_equal_to([self.engine.search(w, 2) for w in words])
+
+
+if __name__ == '__main__':
+    unittest.main()